@@ -179,12 +179,9 @@ class Operator(QObject):
     @pyqtSlot(QVariant)
     def load_automata(self, filename):
         automata = Automata.read_from_json(filename[0].toString().replace('.json', '').replace('file://', ''))
-        if automata and len(self._automatas) < 2:
+        if automata:
             self._automatas.append(automata)
             self.automatas = self._automatas
-        else:
-            # TODO: Show some dialog to the user
-            print('Reached the max number automatas')
 
     @pyqtSlot(QVariant)
     def clear_automatas(self):
@@ -226,23 +223,23 @@ class Operator(QObject):
 
     @pyqtSlot(QVariant)
     def dfa_union(self):
-        if len(self._automatas) != 2:
+        if len(self._automatas) < 2:
             # TODO: Show some dialog to the user
-            print('You need two automatas to perform this operation')
+            print('You need two or more automatas to perform this operation')
             return
 
-        result = self._automatas[0].union(self._automatas[1])
+        result = Automata.union_all(self._automatas)
         self._automataFromAutomata = result
         self.automataFromAutomata = self._automataFromAutomata
 
     @pyqtSlot(QVariant)
     def dfa_intersection(self):
-        if len(self._automatas) != 2:
+        if len(self._automatas) < 2:
             # TODO: Show some dialog to the user
-            print('You need two automatas to perform this operation')
+            print('You need two or more automatas to perform this operation')
             return
 
-        result = self._automatas[0].intersection(self._automatas[1])
+        result = Automata.intersection_all(self._automatas)
         self._automataFromAutomata = result
         self.automataFromAutomata = self._automataFromAutomata
 
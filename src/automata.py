@@ -11,8 +11,14 @@ Alunos:
 - Gabriel Leal Chittolina Amaral
 - Lucas João Martins
 """
-import json
-import itertools
+from array import array
+
+from .compiled import CompiledAutomata, NO_TRANSITION
+from .frozen import FrozenAutomata
+from .lazy import LazyDFA
+from .minimization import brzozowski, hopcroft, quotient, valmari
+from .product import product
+from . import decision, jsonio, storage
 from .utils import Utils
 
 
@@ -23,8 +29,27 @@ class Automata:
     then this property is defined.
     """
 
-    def __init__(self, alphabet, states, q0, final_states, transitions):
-        if self.validate(alphabet, states, q0, final_states, transitions):
+    def __init__(self, alphabet, states, q0, final_states, transitions,
+                 validation='basic'):
+        """Constructs an automata
+
+        validation is one of:
+        - 'basic': the checks of validate, about types and sets;
+        - 'full': also checks each transition, see validate;
+        - 'trusted': only checks that there are states. It is meant to the
+        automatas made by the algorithms, that are valid by construction,
+        so the alphabet, the final states and the transitions may be empty,
+        as in the automatas of the languages {} and {&}.
+        """
+        if validation == 'trusted':
+            valid = bool(states)
+        elif validation in ('basic', 'full'):
+            valid = self.validate(alphabet, states, q0, final_states,
+                                  transitions, validation == 'full')
+        else:
+            raise ValueError('Unknown validation to create an automata.')
+
+        if valid:
             self.alphabet = alphabet  # type is a set of string
             self.states = states  # type is a set of string
             self.q0 = q0  # type is a string
@@ -34,49 +59,271 @@ class Automata:
         else:
             raise ValueError('Invalid input to create an automata.')
 
-        self.deterministic = self._is_deterministic()
-
-    def save_json(self, filename):
-        """Save in filesystem a json file from an automata
+    @property
+    def transitions(self):
+        """Dict of namedtuple(state, symbol) to the set of target states
 
-        The path in filename don't need contain the '.json' extension.
+        An automata made by from_compiled builds it from the compiled form
+        only when it is first read.
         """
-        data = {}
-        data['alphabet'] = list(self.alphabet)
-        data['states'] = list(self.states)
-        data['q0'] = self.q0
-        data['final_states'] = list(self.final_states)
-        data['transitions'] = [(k[0], k[1], list(v))
-                               for k, v in self.transitions.items()]
-
-        with open(filename + '.json', 'w') as write_file:
-            json.dump(data, write_file, indent=4)
-
-    def _is_deterministic(self):
+        if self._transitions is None:
+            self._transitions = self._transitions_of(self._compiled)
+        return self._transitions
+
+    @transitions.setter
+    def transitions(self, value):
+        self._transitions = value
+        self._compiled = None
+        self._counts = None
+
+    @property
+    def deterministic(self):
         """Check if the automata is deterministic.
 
         1. There are no moves on input &, and
         2. For each state s and input symbol a, there is exactly one edge out
         of s labeled a.
+
+        The transitions are counted once (see _transition_counts), so this
+        check costs constant time. With no irregular transition, each one is
+        by a symbol to a single state, so they are as many as the filled.
         """
-        if len(self.transitions) != len(self.alphabet) * len(self.states):
-            return False
+        irregular, filled = self._transition_counts()
+        return not irregular and \
+            filled == len(self.alphabet) * len(self.states)
+
+    @property
+    def complete(self):
+        """Check if every state has a move by every symbol"""
+        _, filled = self._transition_counts()
+        symbols = len(self.alphabet) - (Utils.EPSILON in self.alphabet)
+        return filled == symbols * len(self.states)
+
+    def _transition_counts(self):
+        """Return the counts behind deterministic and complete
+
+        The counts are a list with the number of transitions that are by &
+        or do not have exactly one target, and the number of transitions by
+        a symbol with some target. They are computed once and then kept up
+        to date by add_transition and remove_transition.
+        """
+        if self._counts is None:
+            counts = [0, 0]
+            for key, value in self.transitions.items():
+                self._count_transition(counts, key, value, 1)
+            self._counts = counts
+        return self._counts
 
-        for key, value in self.transitions.items():
-            if key[1] == Utils.EPSILON or len(value) != 1:
-                return False
+    @staticmethod
+    def _count_transition(counts, key, value, sign):
+        """Helper to _transition_counts, add or remove a transition"""
+        if key[1] == Utils.EPSILON or len(value) != 1:
+            counts[0] += sign
+        if key[1] != Utils.EPSILON and value:
+            counts[1] += sign
+
+    def add_transition(self, state, symbol, target):
+        """Add a move from state by symbol to target
+
+        The counts of deterministic and complete are updated in constant
+        time and the compiled form is dropped.
+        """
+        if state not in self.states or target not in self.states or \
+                (symbol != Utils.EPSILON and symbol not in self.alphabet):
+            raise ValueError('Invalid transition to the automata.')
 
-        return True
+        key = Utils.TRANSITION(state, symbol)
+        old = self.transitions.get(key)
+        new = set(old) if old is not None else set()
+        new.add(target)
+        self._replace_transition(key, old, new)
+
+    def remove_transition(self, state, symbol, target=None):
+        """Remove the move from state by symbol to target, or all of them
 
-    def to_dfa(self):
+        See add_transition.
+        """
+        key = Utils.TRANSITION(state, symbol)
+        old = self.transitions.get(key)
+        if old is None or (target is not None and target not in old):
+            raise ValueError('The automata has no such transition.')
+
+        new = None
+        if target is not None:
+            new = set(old)
+            new.discard(target)
+        self._replace_transition(key, old, new or None)
+
+    def _replace_transition(self, key, old, new):
+        """Helper to replace the targets of a key, None when there are none"""
+        counts = self._transition_counts()
+        if old is not None:
+            self._count_transition(counts, key, old, -1)
+            del self.transitions[key]
+        if new is not None:
+            self._count_transition(counts, key, new, 1)
+            self.transitions[key] = new
+        self._compiled = None
+
+    def compile(self):
+        """Return the compiled form of the automata
+
+        The result is a CompiledAutomata, where states and symbols are
+        interned to integer ids. It is built once and reused until the
+        transitions are replaced. After changing the transitions in place,
+        call invalidate() to drop it.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledAutomata.from_automata(self)
+        return self._compiled
+
+    def freeze(self):
+        """Return an immutable and hashable copy of a DFA
+
+        See FrozenAutomata.
+        """
+        return FrozenAutomata(self.compile())
+
+    def invalidate(self):
+        """Drop everything derived from the transitions"""
+        if self._transitions is None:
+            self._transitions = self._transitions_of(self._compiled)
+        self._compiled = None
+        self._counts = None
+
+    @staticmethod
+    def from_compiled(compiled):
+        """Return an automata from its compiled form
+
+        The automata is trusted (see __init__). Its transitions are counted
+        over the compiled form and the dict of transitions is only built
+        when it is read, so automatas made by the algorithms keep only the
+        compiled table until then.
+        """
+        names = compiled.states
+        final_states = {names[s] for s in range(compiled.size)
+                        if compiled.accepting[s]}
+        automata = Automata(set(compiled.symbols), set(names),
+                            names[compiled.q0], final_states, None,
+                            validation='trusted')
+        automata._compiled = compiled
+        automata._counts = Automata._compiled_counts(compiled)
+        return automata
+
+    @staticmethod
+    def _compiled_counts(compiled):
+        """Helper to from_compiled, the counts of _transition_counts"""
+        if compiled.deterministic:
+            table = compiled.table
+            missing = table.count(NO_TRANSITION) if isinstance(table, array) \
+                else table.tolist().count(NO_TRANSITION)
+            return [0, len(table) - missing]
+
+        counts = [0, 0]
+        for targets in compiled.targets:
+            if targets:
+                counts[0] += len(targets) != 1
+                counts[1] += 1
+        counts[0] += sum(1 for targets in compiled.epsilon if targets)
+        return counts
+
+    @staticmethod
+    def _transitions_of(compiled):
+        """Helper to transitions, build the dict from the compiled form"""
+        names = compiled.states
+        transitions = {}
+        for state in range(compiled.size):
+            name = names[state]
+            for symbol, char in enumerate(compiled.symbols):
+                targets = compiled.successors(state, symbol)
+                if targets:
+                    transitions[Utils.TRANSITION(name, char)] = \
+                        {names[t] for t in targets}
+            targets = compiled.epsilon_successors(state)
+            if targets:
+                transitions[Utils.TRANSITION(name, Utils.EPSILON)] = \
+                    {names[t] for t in targets}
+        return transitions
+
+    def save_json(self, filename, compact=False, grouped=False):
+        """Save in filesystem a json file from an automata
+
+        The path in filename don't need contain the '.json' extension.
+
+        The file is written as the transitions are read, with no copy of
+        them (see jsonio.dump_object). With compact, there is no indentation
+        or spaces. With grouped, transitions are written as an object of
+        each state to an object of each symbol to the target states, which
+        is smaller than the list of [state, symbol, [states]]. read_from_json
+        reads both layouts, and the groups are read one by one from the
+        rows of the compiled form.
+        """
+        if grouped:
+            transitions = jsonio.STREAMED_OBJECT(
+                self._grouped_rows(self.compile()))
+        else:
+            transitions = jsonio.STREAMED_ARRAY(
+                (k[0], k[1], list(v)) for k, v in self.transitions.items())
+
+        members = [
+            ('alphabet', list(self.alphabet)),
+            ('states', list(self.states)),
+            ('q0', self.q0),
+            ('final_states', list(self.final_states)),
+            ('transitions', transitions)
+        ]
+        with open(filename + '.json', 'w') as write_file:
+            jsonio.dump_object(write_file, members,
+                               indent=None if compact else 4)
+
+    @staticmethod
+    def _grouped_rows(compiled):
+        """Helper to save_json, yield (state, {symbol: [states]}) by row"""
+        names = compiled.states
+        for state in range(compiled.size):
+            row = {}
+            for symbol, char in enumerate(compiled.symbols):
+                targets = compiled.successors(state, symbol)
+                if targets:
+                    row[char] = [names[t] for t in targets]
+            targets = compiled.epsilon_successors(state)
+            if targets:
+                row[Utils.EPSILON] = [names[t] for t in targets]
+            if row:
+                yield names[state], row
+
+    def save_binary(self, filename):
+        """Save in filesystem a binary file from a DFA
+
+        The path in filename don't need contain the '.atm' extension. See
+        storage.dumps for the format.
+        """
+        storage.save(self.compile(), filename + storage.EXTENSION)
+
+    def to_dfa(self, lazy=False, max_states=LazyDFA.MAX_STATES,
+               engine='bitset'):
         """Conversion of an NFA to a DFA
 
         Use the technique known as 'the subset construction' to return the new
         DFA
+
+        The engine 'bitset' runs the construction over the compiled automata,
+        with subsets as bitsets. The engine 'subset' is the original one,
+        over sets of state names.
+
+        With lazy, return instead a LazyDFA, that only builds the subsets
+        reached by the matched words and keeps at most max_states of them.
         """
         if self.deterministic:
             raise Warning('Automata is a DFA. Isnt necessary make conversion.')
 
+        if lazy:
+            return LazyDFA(self.compile(), max_states)
+        if engine == 'bitset':
+            return Automata.from_compiled(self.compile().determinize())
+        if engine != 'subset':
+            raise ValueError('Unknown engine to make conversion.')
+
         # start determinization process
         new_q0 = frozenset(self._e_closure([self.q0]))
         new_states = [new_q0]
@@ -124,7 +371,8 @@ class Automata:
 
         # all done, just return a new Automata
         return Automata(self.alphabet, normal_states, normal_q0,
-                        normal_final_states, normal_transitions)
+                        normal_final_states, normal_transitions,
+                        validation='trusted')
 
     def transition(self, state, src):
         """Return a transition for the given state and input
@@ -143,28 +391,40 @@ class Automata:
             return self.transitions[transition]
         return False
 
+    def accepts(self, word):
+        """Check if the word is accepted by the automata
+
+        The word is a string or any iterable of symbols of the alphabet.
+        """
+        return self.compile().accepts(word)
+
+    def accepts_many(self, words):
+        """Yield, for each word of the iterable, if it is accepted
+
+        All words are run over the same compiled automata, so prefer this
+        to many calls of accepts().
+        """
+        return self.compile().accepts_many(words)
+
     def _e_closure(self, states):
         """Return e-closure of states parameter
 
         Set of NFA states reachable from some NFA state s in set states on
         e-transitions alone.
 
+        The closure of each state is computed once, in the compiled automata,
+        and reused until the transitions change.
+
         Type of parameter 'states' is a list.
         """
-        stack = [s for s in states]
-        e_closure = states
-        while stack:
-            top_state = stack.pop()
-            transition = Utils.TRANSITION(top_state, Utils.EPSILON)
+        compiled = self.compile()
+        closures = compiled.closures()
+        mask = 0
+        for state in states:
+            mask |= closures[compiled.state_index[state]]
 
-            # avoid KeyError with state without transition by epsilon
-            if transition in self.transitions:
-                for state in self.transitions[transition]:
-                    if state not in e_closure:
-                        e_closure.append(state)
-                        stack.append(state)
-
-        return {s for s in e_closure}
+        names = compiled.states
+        return {names[s] for s in compiled.bits(mask)}
 
     def _move(self, states, char):
         """Return move result by char in states.
@@ -172,21 +432,28 @@ class Automata:
         List of NFA states to which there is a transition on input symbol char
         from some state s in states.
         """
-        stack = [s for s in states]
-        result = []
-        while stack:
-            top_state = stack.pop()
-            transition = Utils.TRANSITION(top_state, char)
+        result = set()
+        for state in states:
+            transition = Utils.TRANSITION(state, char)
 
             # avoid KeyError with state without transition by epsilon
             if transition in self.transitions:
-                for state in self.transitions[transition]:
-                    if state not in result:
-                        result.append(state)
+                result.update(self.transitions[transition])
 
-        return result
+        return list(result)
 
-    def minimize(self):
+    def remove_epsilon(self):
+        """Return an equivalent automata without moves by epsilon
+
+        States keep their names. A state moves by a symbol to the closure of
+        the targets of its own closure, and is final when its closure has a
+        final state. States that are no longer reachable from q0, as the
+        target of a move on & that has no moves itself, are left out.
+        """
+        free = self.compile().without_epsilon()
+        return Automata.from_compiled(free.restricted(free.reachable()))
+
+    def minimize(self, strategy='hopcroft'):
         """Minimize a DFA by the Hopcroft's algorithm.
 
         Hopcroft's algorithm says that to minimize a automata it's necessary
@@ -195,62 +462,31 @@ class Automata:
         2. Merge nondistinguishable states
 
         Then return a minimized DFA.
+
+        Other algorithms are chosen by strategy:
+        - 'brzozowski': reverse and determinize twice. Accepts an NFA too;
+        - 'valmari': the Valmari-Lehtinen's algorithm for partial DFAs. The
+        result has no dead state, since states that cannot reach a final
+        state are removed.
         """
+        if strategy == 'brzozowski':
+            return Automata.from_compiled(brzozowski(self.compile()))
+        if strategy == 'valmari':
+            return Automata.from_compiled(valmari(self.compile()))
+        if strategy != 'hopcroft':
+            raise ValueError('Unknown strategy to make minimization.')
+
         if not self.deterministic:
             raise Warning('Its necessary be a DFA to make minimization.')
 
-        # start steps of minimization
-        unreachable_states = self._define_unreachable()
-
-        new_states = self.states - unreachable_states
-        new_final_states = self.final_states - unreachable_states
-
-        partition = self._merge_nondistinguishable(new_states,
-                                                   new_final_states)
-
-        # two step was done. The next process is similar to 'normalizar'
-        # of determinization. Probably, this could be coded better
-        normal_states = set()
-        normal_final_states = set()
-        final_names = {}
-        i = 0
-        for group in partition:
-            name = 'q' + str(i)
-            i += 1
-            final_names[name] = group
-            normal_states.add(name)
-
-            if self.q0 in group:
-                normal_q0 = name
-
-            if self.final_states.intersection(group):
-                normal_final_states.add(name)
-
-        normal_transitions = {}
-        for group in partition:
-            old_source = next(iter(group))
-            for char in self.alphabet:
-                old_target = self.transitions[Utils.TRANSITION(old_source,
-                                                               char)]
-
-                new_source = None
-                new_target = None
-                for name, value in final_names.items():
-                    if old_source in value:
-                        new_source = name
-
-                    if old_target.intersection(value):
-                        new_target = name
-
-                    if new_source is not None and new_target is not None:
-                        break
-
-                normal_transitions[Utils.TRANSITION(new_source, char)] = \
-                    new_target
+        # both steps are made over the compiled table: the unreachable
+        # states are left out of the partition and the nondistinguishable
+        # ones end in the same block
+        compiled = self.compile()
+        block, count = hopcroft(compiled, compiled.reachable())
 
         # all done, just return a new Automata
-        return Automata(self.alphabet, normal_states, normal_q0,
-                        normal_final_states, normal_transitions)
+        return Automata.from_compiled(quotient(compiled, block, count))
 
     def _define_unreachable(self):
         """Return unreachable states
@@ -264,26 +500,10 @@ class Automata:
             raise Warning('Its necessary be a DFA to define unreachable'
                           ' states.')
 
-        reachable_states = {self.q0}
-        new_states = {self.q0}
-
-        while True:
-            tmp = set()
-            for state in new_states:
-                for char in self.alphabet:
-                    # only works because its a DFA
-                    # solution to the problem of add a set inside other set
-                    set_of_target = self.transitions[
-                        Utils.TRANSITION(state, char)].copy()
-                    tmp.add(set_of_target.pop())
-
-            new_states = tmp - reachable_states
-            reachable_states = reachable_states.union(new_states)
-
-            if not new_states:
-                break
-
-        return self.states - reachable_states
+        compiled = self.compile()
+        reachable = compiled.reachable()
+        return {name for name, flag in zip(compiled.states, reachable)
+                if not flag}
 
     def _merge_nondistinguishable(self, new_states, new_final_states):
         """Return partition with the merge of nondistinguishable states
@@ -298,46 +518,22 @@ class Automata:
             raise Warning('Its necessary be a DFA to merge nondistinguishable'
                           ' states.')
 
-        nonaccepting_states = new_states - new_final_states
-        partition = [new_final_states, nonaccepting_states]
-        work_list = [new_final_states]
-        work_partition = partition.copy()
+        compiled = self.compile()
+        include = bytearray(compiled.size)
+        accepting = bytearray(compiled.size)
+        for state in new_states:
+            include[compiled.state_index[state]] = 1
+        for state in new_final_states:
+            accepting[compiled.state_index[state]] = 1
 
-        while work_list:
-            group = work_list.pop()
-            for char in self.alphabet:
-                # create a set of states for which a transition on char leads
-                # to a state in group
-                sources = set()
-                for key, value in self.transitions.items():
-                    if key[1] == char and value.intersection(group):
-                        sources.add(key[0])
-
-                while work_partition:
-                    item = work_partition.pop()
-                    intersection_result = sources.intersection(item)
-                    relative_complement_result = item - sources
-                    if intersection_result and relative_complement_result:
-                        partition.remove(item)
-                        partition.append(intersection_result)
-                        partition.append(relative_complement_result)
-                        work_partition.append(intersection_result)
-                        work_partition.append(relative_complement_result)
-
-                        if item in work_list:
-                            work_list.remove(item)
-                            work_list.append(intersection_result)
-                            work_list.append(relative_complement_result)
-                        else:
-                            if len(intersection_result) <= \
-                               len(relative_complement_result):
-                                work_list.append(intersection_result)
-                            else:
-                                work_list.append(relative_complement_result)
-
-                work_partition = partition.copy()
-
-        return partition
+        block, count = hopcroft(compiled, include, accepting)
+        partition = [set() for _ in range(count)]
+        for state, name in enumerate(compiled.states):
+            if block[state] != NO_TRANSITION:
+                partition[block[state]].add(name)
+
+        # a dead state added to a partial DFA has no name
+        return [group for group in partition if group]
 
     def union(self, other):
         """Make union of two DFAs
@@ -366,106 +562,168 @@ class Automata:
         managed by the parameter 'is_union'.
 
         Return a resultant automata.
+
+        Only pairs of states reachable from (q0, q0') are built, in a
+        breadth-first search. Pairs that cannot reach a final state are all
+        merged into a single dead state and not explored. When the pair of
+        initial states is already dead, the language is empty, the search is
+        not even started and the result is a single state that is not
+        final. See product.product.
         """
         if not self.deterministic or not other.deterministic:
             raise Warning('The inputs need to be DFAs to make the union.')
 
-        new_alphabet = self.alphabet.union(other.alphabet)
+        return Automata.from_compiled(
+            product([self.compile(), other.compile()], is_union))
 
-        final_names = {}
-        new_states = set()
-        i = 0
-        for cartersian_product in itertools.product(self.states, other.states):
-            name = 'q' + str(i)
-            new_states.add(name)
-            final_names[cartersian_product] = name
-            i += 1
+    @staticmethod
+    def union_all(automatas, minimize=False):
+        """Make union of many DFAs at once
 
-        new_q0 = final_names[(self.q0, other.q0)]
+        The product is built over tuples of states in a single pass, with no
+        intermediate automata. With minimize, each DFA is minimized before
+        and the result after.
+        """
+        return Automata.from_compiled(product(
+            [automata.compile() for automata in automatas], True, minimize))
 
-        if is_union:
-            first_group = {final_names[y] for y in itertools.product(
-                self.final_states, other.states)}
-            second_group = {final_names[z] for z in itertools.product(
-                self.states, other.final_states)}
-            new_final_states = first_group.union(second_group)
-        else:
-            new_final_states = {final_names[y] for y in itertools.product(
-                self.final_states, other.final_states)}
+    @staticmethod
+    def intersection_all(automatas, minimize=False):
+        """Make intersection of many DFAs at once
 
-        new_transitions = {}
-        for key, value in final_names.items():
-            for char in new_alphabet:
-                # possible do the next lines because of dfa's check at begin
-                first_target = self.transitions.get(Utils.TRANSITION(
-                    key[0], char))
-                if first_target is not None:
-                    first_target = next(iter(first_target))
+        The product is built over tuples of states in a single pass, with no
+        intermediate automata. With minimize, each DFA is minimized before
+        and the result after.
+        """
+        return Automata.from_compiled(product(
+            [automata.compile() for automata in automatas], False, minimize))
 
-                second_target = other.transitions.get(Utils.TRANSITION(
-                    key[1], char))
-                if second_target is not None:
-                    second_target = next(iter(second_target))
+    def is_empty(self, witness=False):
+        """Check if the automata accepts no word
 
-                real_target = final_names.get((first_target, second_target))
+        With witness, return a tuple (result, word), where word is a
+        shortest accepted word, or None when the language is empty. Works
+        for NFAs, see decision.accepted_word.
+        """
+        word = decision.accepted_word(self.compile())
+        return self._decided(word is None, word, witness)
 
-                new_transitions[Utils.TRANSITION(value, char)] = {real_target}
+    def is_equivalent(self, other, witness=False):
+        """Check if both automatas accept the same language
 
-        return Automata(new_alphabet, new_states, new_q0, new_final_states,
-                        new_transitions)
+        NFAs are accepted and determinized on the fly. The check stops at
+        the first word accepted by only one of them, with no minimization
+        or product, see decision.difference_word. With witness, return a
+        tuple (result, word), where word is that word or None.
+        """
+        word = decision.difference_word(self.compile(), other.compile())
+        return self._decided(word is None, word, witness)
+
+    def is_subset(self, other, witness=False):
+        """Check if every word accepted by self is accepted by other
+
+        Only other is determinized, and on the fly, see
+        decision.not_included_word. With witness, return a tuple
+        (result, word), where word is accepted by self and not by other, or
+        None.
+        """
+        word = decision.not_included_word(self.compile(), other.compile())
+        return self._decided(word is None, word, witness)
+
+    @staticmethod
+    def _decided(result, word, witness):
+        """Helper to the decision methods, add the word with witness"""
+        if witness:
+            return result, word
+        return result
 
     def to_grammar(self):
-        """Return a grammar equivalent to this automaton."""
-        from .grammar import Grammar
-        if not self.deterministic:
-            dfa = self.to_dfa()
-            return dfa.to_grammar()
-        initial_symbol = self.q0.upper()
-        productions = self._make_productions()
-        return Grammar(productions, initial_symbol)
+        """Return a grammar equivalent to this automaton.
 
-    def _make_productions(self):
-        productions = list()
-        for src in self.transitions:
-            for output in self.transitions[src]:
-                self._include_productions(productions, src, output)
-        return productions
+        NFAs are converted directly, with no determinization: moves on & are
+        removed first (see CompiledAutomata.without_epsilon), then each move
+        "p -a-> q" gives "P -> aQ", and also "P -> a" when q is final. When
+        q0 is final, "Q0 -> &" keeps the empty word.
 
-    def _include_productions(self, productions, src, output):
-        if output in self.final_states:
-            production = (src[0].upper(), src[1])
-            productions.append(production)
-        production = (src[0].upper(), src[1], output.upper())
-        productions.append(production)
+        Nonterminals are the state names in upper case, made once for each
+        state id. If two names become the same, the names are kept as is.
+        """
+        from .grammar import Grammar
+        compiled = self.compile().without_epsilon()
+        names = [state.upper() for state in compiled.states]
+        if len(set(names)) != len(names):
+            names = list(compiled.states)
+
+        accepting = compiled.accepting
+        productions = []
+        for state in range(compiled.size):
+            head = names[state]
+            for symbol, char in enumerate(compiled.symbols):
+                for target in compiled.successors(state, symbol):
+                    productions.append((head, char, names[target]))
+                    if accepting[target]:
+                        productions.append((head, char))
+        initial_symbol = names[compiled.q0]
+        if accepting[compiled.q0]:
+            productions.append((initial_symbol, Utils.EPSILON))
+        return Grammar(productions, initial_symbol)
 
     @staticmethod
-    def read_from_json(filename):
+    def read_from_json(filename, validate=False):
         """Return an automata from a json file
 
         The path in filename don't need contain the '.json' extension.
+
+        The file is read by chunks and each transition goes to the dict as
+        soon as it is read (see jsonio.load_object), in any of the layouts
+        of save_json. With validate, each transition is checked as it is
+        read and, at the end, its states and symbol must be declared.
         """
+        transitions = {}
+        used_states = set()
+        used_symbols = set()
+
+        def add_transition(element):
+            for lst in jsonio.transitions_of(element):
+                if validate:
+                    jsonio.check_transition(lst)
+                    used_states.add(lst[0])
+                    used_states.update(lst[2])
+                    used_symbols.add(lst[1])
+                transition = Utils.TRANSITION(lst[0], lst[1])
+                transitions[transition] = set(lst[2])
+
         # str come as unicode from json
         with open(filename + '.json', 'r') as load_file:
-            data = json.load(load_file)
+            data = jsonio.load_object(load_file,
+                                      {'transitions': add_transition})
+        if validate:
+            jsonio.check_declared(data, used_states, used_symbols)
 
         alphabet = set(data['alphabet'])
         states = set(data['states'])
         q0 = str(data['q0'])
         final_states = set(data['final_states'])
 
-        transitions = {}
-        for lst in data['transitions']:
-            transition = Utils.TRANSITION(lst[0], lst[1])
-            transitions[transition] = set(lst[2])
-
         return Automata(alphabet, states, q0, final_states, transitions)
 
     @staticmethod
-    def validate(alphabet, states, q0, final_states, transitions):
+    def read_from_binary(filename):
+        """Return an automata from a binary file
+
+        The path in filename don't need contain the '.atm' extension.
+        """
+        return Automata.from_compiled(
+            storage.load(filename + storage.EXTENSION))
+
+    @staticmethod
+    def validate(alphabet, states, q0, final_states, transitions,
+                 full=False):
         """Do automata validation about type, size and inner relationship
 
         To keep simple, don't has validation in transitions or complex
-        validations in alphabet.
+        validations in alphabet, unless full is set: then each transition
+        must be from a state, by a symbol of the alphabet or &, to states.
         """
         if not isinstance(alphabet, set) or \
            not isinstance(states, set) or \
@@ -485,4 +743,12 @@ class Automata:
         if alphabet.intersection(states):
             return False
 
+        if full:
+            symbols = alphabet | {Utils.EPSILON}
+            for key, value in transitions.items():
+                if not isinstance(key, tuple) or len(key) != 2 or \
+                        key[0] not in states or key[1] not in symbols or \
+                        not states.issuperset(value):
+                    return False
+
         return True
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+from collections import OrderedDict, namedtuple
+
+STATS = namedtuple('Stats', ['hits', 'misses', 'evictions', 'size',
+                             'max_size'])
+
+
+class CompilationCache:
+    """Cache of compiled automata, with LRU eviction
+
+    Values are built by a function on a miss and kept by key. When the
+    cache has more than max_size values, the least recently used one is
+    evicted.
+
+    With a store (see storage.AutomataStore), values are automatas and a
+    miss is first looked up in the store, and saved there once built, so
+    other processes start with the automatas already compiled.
+    """
+
+    MAX_SIZE = 256
+
+    def __init__(self, max_size=MAX_SIZE, store=None):
+        if max_size < 1:
+            raise ValueError('The cache must hold at least one value.')
+
+        self.max_size = max_size
+        self.store = store
+        self._values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Return the number of values in the cache"""
+        return len(self._values)
+
+    def __contains__(self, key):
+        """Check if the key has a value in the cache"""
+        return key in self._values
+
+    def get(self, key, build):
+        """Return the value of key, calling build() on a miss"""
+        values = self._values
+        value = values.get(key)
+        if value is not None:
+            values.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = self._load(key)
+        if value is None:
+            value = build()
+            if self.store is not None:
+                self.store.save(key, value.compile())
+        values[key] = value
+        self._evict()
+        return value
+
+    def resize(self, max_size):
+        """Change the bound of the cache, evicting values if needed"""
+        if max_size < 1:
+            raise ValueError('The cache must hold at least one value.')
+        self.max_size = max_size
+        self._evict()
+
+    def clear(self):
+        """Remove all values and reset the statistics"""
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Return the hits, misses, evictions, size and max_size"""
+        return STATS(self.hits, self.misses, self.evictions,
+                     len(self._values), self.max_size)
+
+    def _load(self, key):
+        """Helper to get, return the automata of key in the store or None"""
+        if self.store is None:
+            return None
+        compiled = self.store.load(key)
+        if compiled is None:
+            return None
+        from .automata import Automata
+        return Automata.from_compiled(compiled)
+
+    def _evict(self):
+        """Helper to remove the least recently used values over the bound"""
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+
+# shared by compile_regex and compile_grammar when no cache is given
+CACHE = CompilationCache()
+
+
+def normalize_pattern(pattern):
+    """Return a regex with redundant postfix operators removed
+
+    A run of '*' and '?' after an operand means the same as a single '*'
+    if it has some '*', or a single '?' otherwise: (a*)* = (a?)* = (a*)? =
+    a* and (a?)? = a?. Where an operand is expected, '*' and '?' are chars,
+    as in RegexParser, and are kept.
+    """
+    normalized = []
+    expect_base = True
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if expect_base:
+            normalized.append(char)
+            expect_base = char == '('
+            i += 1
+        elif char in '*?':
+            j = i
+            while j < len(pattern) and pattern[j] in '*?':
+                j += 1
+            normalized.append('*' if '*' in pattern[i:j] else '?')
+            i = j
+        else:
+            normalized.append(char)
+            expect_base = char in '(|'
+            i += 1
+    return ''.join(normalized)
+
+
+def grammar_key(grammar):
+    """Return a key of a grammar that ignores the order of productions"""
+    return (grammar._initial_symbol, frozenset(grammar._productions))
+
+
+def compile_regex(pattern, cache=None):
+    """Return the minimal DFA of a regex, from the cache when possible
+
+    The regex is parsed by RegexParser, converted to a complete DFA by the
+    direct construction and minimized.
+    Patterns are keyed after normalize_pattern. The returned Automata is
+    shared by all callers with the same key, so it must not be changed.
+    """
+    from .regex import RegexParser
+    cache = CACHE if cache is None else cache
+    normalized = normalize_pattern(pattern)
+    return cache.get(('regex', normalized), lambda: RegexParser(
+        normalized).to_automata().minimize())
+
+
+def compile_grammar(grammar, cache=None):
+    """Return the minimal DFA of a grammar, from the cache when possible
+
+    The grammar is converted by Grammar.to_dfa and minimized. Grammars are
+    keyed by grammar_key. The returned Automata is shared by all callers
+    with the same key, so it must not be changed.
+    """
+    cache = CACHE if cache is None else cache
+    return cache.get(('grammar',) + grammar_key(grammar),
+                     lambda: grammar.to_dfa().minimize())
@@ -0,0 +1,562 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+from array import array
+
+from .utils import Utils
+
+NO_TRANSITION = -1
+
+
+def components(size, edges):
+    """Return the strongly connected components of a graph, by Tarjan
+
+    The vertices are ids in range(size) and edges[v] has the targets of v.
+    Each component is a list of vertices. They come out in reverse
+    topological order: a component is after every component it reaches.
+    """
+    order = [-1] * size  # discovery order of each vertex
+    low = [0] * size
+    on_stack = bytearray(size)
+    stack = []
+    result = []
+    counter = 0
+
+    for root in range(size):
+        if order[root] >= 0:
+            continue
+
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(edges[root]))]
+        while work:
+            vertex, targets = work[-1]
+            for target in targets:
+                if order[target] < 0:
+                    order[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work.append((target, iter(edges[target])))
+                    break
+                elif on_stack[target]:
+                    low[vertex] = min(low[vertex], order[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[vertex])
+                if low[vertex] == order[vertex]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        members.append(member)
+                        if member == vertex:
+                            break
+                    result.append(members)
+    return result
+
+
+class CompiledAutomata:
+    """Compact representation of an automata
+
+    States and symbols are interned to dense integer ids. A DFA keeps its
+    transitions in a flat array('i') of shape states x symbols, where the
+    move of state s by symbol a is table[s * len(symbols) + a] and
+    NO_TRANSITION marks a missing move. An NFA keeps, for the same cells, a
+    tuple of target ids, plus a tuple of epsilon targets per state.
+
+    State names are optional. When they are not given, the state of id i is
+    named 'qi', the same convention used by the algorithms of Automata.
+    """
+
+    def __init__(self, symbols, size, q0, accepting, table=None,
+                 targets=None, epsilon=None, states=None):
+        self.symbols = tuple(symbols)  # type is a tuple of string
+        self.symbol_index = {s: i for i, s in enumerate(self.symbols)}
+        self.size = size  # number of states
+        self.q0 = q0  # type is an int
+        self.accepting = accepting  # bytearray with a flag per state
+        self.table = table  # array('i') of states x symbols, only for DFA
+        self.targets = targets  # list of tuple of int, only for NFA
+        self.epsilon = epsilon  # list of tuple of int, only for NFA
+        self.deterministic = table is not None
+        self._states = tuple(states) if states is not None else None
+        self._state_index = None
+        self._closures = None
+        self._moves = None
+
+    @property
+    def states(self):
+        """Tuple with the name of each state, indexed by the state id"""
+        if self._states is None:
+            self._states = tuple('q' + str(i) for i in range(self.size))
+        return self._states
+
+    @property
+    def state_index(self):
+        """Dict from the name of a state to its id"""
+        if self._state_index is None:
+            self._state_index = {s: i for i, s in enumerate(self.states)}
+        return self._state_index
+
+    def successors(self, state, symbol):
+        """Return a tuple with the targets of state by the symbol id"""
+        cell = state * len(self.symbols) + symbol
+        if self.deterministic:
+            target = self.table[cell]
+            if target == NO_TRANSITION:
+                return ()
+            return (target,)
+        return self.targets[cell]
+
+    def epsilon_successors(self, state):
+        """Return a tuple with the targets of state by epsilon"""
+        if self.deterministic:
+            return ()
+        return self.epsilon[state]
+
+    def is_complete(self):
+        """Check if every state has a move by every symbol"""
+        if not self.deterministic:
+            return False
+        return NO_TRANSITION not in self.table
+
+    def completed_table(self, symbols):
+        """Return a complete DFA table over the given sequence of symbols
+
+        Missing moves, including the ones by symbols out of the alphabet,
+        go to a new dead state with the id self.size. The result is the
+        tuple (table, size), where size counts the dead state if added.
+        """
+        if not self.deterministic:
+            raise Warning('Its necessary be a DFA to complete the table.')
+
+        k = len(self.symbols)
+        columns = [self.symbol_index.get(s, NO_TRANSITION) for s in symbols]
+        if columns == list(range(k)) and self.is_complete():
+            return self.table, self.size
+
+        dead = self.size
+        table = array('i', [dead]) * ((self.size + 1) * len(symbols))
+        for state in range(self.size):
+            row = state * len(symbols)
+            for symbol, column in enumerate(columns):
+                if column != NO_TRANSITION:
+                    target = self.table[state * k + column]
+                    if target != NO_TRANSITION:
+                        table[row + symbol] = target
+        return table, self.size + 1
+
+    def reachable(self):
+        """Return a bytearray flagging the states reachable from q0"""
+        seen = bytearray(self.size)
+        seen[self.q0] = 1
+        stack = [self.q0]
+        k = len(self.symbols)
+        while stack:
+            state = stack.pop()
+            for symbol in range(k):
+                for target in self.successors(state, symbol):
+                    if not seen[target]:
+                        seen[target] = 1
+                        stack.append(target)
+            for target in self.epsilon_successors(state):
+                if not seen[target]:
+                    seen[target] = 1
+                    stack.append(target)
+        return seen
+
+    def coreachable(self):
+        """Return a bytearray flagging the states that reach a final state"""
+        predecessors = [[] for _ in range(self.size)]
+        for state in range(self.size):
+            for symbol in range(len(self.symbols)):
+                for target in self.successors(state, symbol):
+                    predecessors[target].append(state)
+            for target in self.epsilon_successors(state):
+                predecessors[target].append(state)
+
+        seen = bytearray(self.accepting)
+        stack = [s for s in range(self.size) if seen[s]]
+        while stack:
+            for source in predecessors[stack.pop()]:
+                if not seen[source]:
+                    seen[source] = 1
+                    stack.append(source)
+        return seen
+
+    def restricted(self, keep):
+        """Return the automata with only the states flagged in keep
+
+        keep must flag q0 and be closed under the moves, as the result of
+        reachable is. The states kept are renumbered in order and keep
+        their names. Return self when all states are kept.
+        """
+        order = [s for s in range(self.size) if keep[s]]
+        if len(order) == self.size:
+            return self
+
+        number = array('i', [NO_TRANSITION]) * self.size
+        for new, old in enumerate(order):
+            number[old] = new
+        targets = []
+        for state in order:
+            for symbol in range(len(self.symbols)):
+                targets.append(tuple(number[t] for t in
+                                     self.successors(state, symbol)))
+        epsilon = [tuple(number[t] for t in self.epsilon_successors(s))
+                   for s in order]
+        return CompiledAutomata.from_cells(
+            self.symbols, len(order), number[self.q0],
+            bytearray(self.accepting[s] for s in order), targets, epsilon,
+            [self.states[s] for s in order])
+
+    @classmethod
+    def from_automata(cls, automata):
+        """Return the compiled form of an Automata
+
+        The initial state gets the id 0 and the other states follow in
+        sorted order. Symbols are sorted too, so the compiled form of equal
+        automatas is always the same.
+        """
+        symbols = sorted(automata.alphabet - {Utils.EPSILON})
+        extra = {key[1] for key in automata.transitions} - \
+            set(symbols) - {Utils.EPSILON}
+        symbols.extend(sorted(extra))
+        symbol_index = {s: i for i, s in enumerate(symbols)}
+
+        states = [automata.q0]
+        states.extend(sorted(automata.states - {automata.q0}))
+        state_index = {s: i for i, s in enumerate(states)}
+
+        size = len(states)
+        k = len(symbols)
+        targets = [()] * (size * k)
+        epsilon = [()] * size
+        try:
+            for key, value in automata.transitions.items():
+                source = state_index[key[0]]
+                ids = tuple(sorted(state_index[t] for t in value
+                                   if t is not None))
+                if key[1] == Utils.EPSILON:
+                    epsilon[source] = ids
+                else:
+                    targets[source * k + symbol_index[key[1]]] = ids
+        except KeyError:
+            raise ValueError('Invalid transition to compile an automata.')
+
+        accepting = bytearray(size)
+        for state in automata.final_states:
+            accepting[state_index[state]] = 1
+
+        return cls.from_cells(symbols, size, 0, accepting, targets, epsilon,
+                              states)
+
+    @classmethod
+    def from_cells(cls, symbols, size, q0, accepting, targets, epsilon,
+                   states=None):
+        """Return a compiled automata from a tuple of targets per cell
+
+        The DFA table is used when there are no epsilon moves and no cell
+        has more than one target.
+        """
+        if any(epsilon) or any(len(ids) > 1 for ids in targets):
+            return cls(symbols, size, q0, accepting, targets=targets,
+                       epsilon=epsilon, states=states)
+
+        table = array('i', [NO_TRANSITION]) * len(targets)
+        for cell, ids in enumerate(targets):
+            if ids:
+                table[cell] = ids[0]
+        return cls(symbols, size, q0, accepting, table=table, states=states)
+
+    @classmethod
+    def read_from_json(cls, filename, validate=False):
+        """Return the compiled form of an automata json file
+
+        The result is the same as Automata.read_from_json(filename)
+        .compile(), but no Automata is built: names are interned to ids as
+        the transitions are streamed, and the moves are kept in arrays of
+        int until the end, when ids are renumbered as in from_automata. See
+        Automata.read_from_json about validate.
+        """
+        from . import jsonio
+        names = {}  # name of a state -> id, by order in the file
+        chars = {}  # symbol -> id, by order in the file
+        sources = array('i')
+        columns = array('i')
+        ends = array('i')
+        flat = array('i')  # targets of the move i are flat[ends[i-1]:ends[i]]
+
+        def add_transition(element):
+            for lst in jsonio.transitions_of(element):
+                if validate:
+                    jsonio.check_transition(lst)
+                sources.append(names.setdefault(lst[0], len(names)))
+                columns.append(chars.setdefault(lst[1], len(chars)))
+                flat.extend(names.setdefault(target, len(names))
+                            for target in lst[2])
+                ends.append(len(flat))
+
+        with open(filename + '.json', 'r') as load_file:
+            data = jsonio.load_object(load_file,
+                                      {'transitions': add_transition})
+        if validate:
+            jsonio.check_declared(data, names, chars)
+
+        q0 = str(data['q0'])
+        declared = set(data['states'])
+        if not declared.issuperset(names):
+            raise ValueError('Invalid transition to compile an automata.')
+        if q0 not in declared:
+            raise ValueError('Invalid input to create an automata.')
+        states = [q0]
+        states.extend(sorted(declared - {q0}))
+        state_index = {s: i for i, s in enumerate(states)}
+        state_id = [state_index[name] for name in names]
+
+        symbols = sorted(set(data['alphabet']) - {Utils.EPSILON})
+        symbols.extend(sorted(set(chars) - set(symbols) - {Utils.EPSILON}))
+        symbol_index = {s: i for i, s in enumerate(symbols)}
+        symbol_id = [symbol_index.get(char) for char in chars]
+
+        size = len(states)
+        k = len(symbols)
+        targets = [()] * (size * k)
+        epsilon = [()] * size
+        start = 0
+        for source, column, end in zip(sources, columns, ends):
+            ids = tuple(sorted(state_id[t] for t in flat[start:end]))
+            start = end
+            if symbol_id[column] is None:
+                epsilon[state_id[source]] = ids
+            else:
+                targets[state_id[source] * k + symbol_id[column]] = ids
+
+        accepting = bytearray(size)
+        for state in data['final_states']:
+            if state not in declared:
+                raise ValueError('Invalid input to create an automata.')
+            accepting[state_index[state]] = 1
+
+        return cls.from_cells(symbols, size, 0, accepting, targets, epsilon,
+                              states)
+
+    def closures(self):
+        """Return the epsilon closure of each state as a bitset
+
+        The closure of the state of id i is an int whose bit j is set when
+        the state j is reachable from i on epsilon moves alone.
+
+        The epsilon graph is condensed by the Tarjan's algorithm. Its
+        strongly connected components come out in reverse topological
+        order, so the closure of a component is its own states plus the
+        closures of the components it reaches, which are already done.
+        States of a component share the same int. Computed once per
+        compiled automata.
+        """
+        if self._closures is not None:
+            return self._closures
+
+        if self.deterministic:
+            self._closures = [1 << state for state in range(self.size)]
+            return self._closures
+
+        epsilon = self.epsilon
+        component = [-1] * self.size
+        component_masks = []
+        for current, members in enumerate(components(self.size, epsilon)):
+            for state in members:
+                component[state] = current
+            mask = 0
+            for state in members:
+                mask |= 1 << state
+                for target in epsilon[state]:
+                    if component[target] != current:
+                        mask |= component_masks[component[target]]
+            component_masks.append(mask)
+
+        self._closures = [component_masks[c] for c in component]
+        return self._closures
+
+    def without_epsilon(self):
+        """Return an equivalent compiled automata without epsilon moves
+
+        A state moves by a symbol to the closure of the targets of its own
+        closure, and is final when its closure has a final state. States
+        and their ids are kept.
+        """
+        if self.deterministic:
+            return self
+
+        k = len(self.symbols)
+        closures = self.closures()
+        accepting_mask = self.accepting_mask()
+        targets = []
+        accepting = bytearray(self.size)
+        for state in range(self.size):
+            closure = closures[state]
+            if closure & accepting_mask:
+                accepting[state] = 1
+            for symbol in range(k):
+                target = self.step(closure, symbol)
+                targets.append(tuple(self.bits(target)))
+        return CompiledAutomata.from_cells(
+            self.symbols, self.size, self.q0, accepting, targets,
+            [()] * self.size, self._states)
+
+    @staticmethod
+    def bits(mask):
+        """Yield the id of each state in a bitset, in increasing order"""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def moves(self):
+        """Return, for each cell, the closure of its targets as a bitset
+
+        The cell of state s and symbol a is at s * len(symbols) + a, as in
+        the DFA table. This join of move and e-closure is what the
+        simulation of an NFA needs at each step.
+        """
+        if self._moves is not None:
+            return self._moves
+
+        closures = self.closures()
+        moves = []
+        for state in range(self.size):
+            for symbol in range(len(self.symbols)):
+                mask = 0
+                for target in self.successors(state, symbol):
+                    mask |= closures[target]
+                moves.append(mask)
+        self._moves = moves
+        return moves
+
+    def accepting_mask(self):
+        """Return the accepting states as a bitset"""
+        mask = 0
+        for state in range(self.size):
+            if self.accepting[state]:
+                mask |= 1 << state
+        return mask
+
+    def step(self, mask, symbol):
+        """Return the bitset of states reached from mask by the symbol id"""
+        moves = self.moves()
+        k = len(self.symbols)
+        result = 0
+        while mask:
+            low = mask & -mask
+            result |= moves[(low.bit_length() - 1) * k + symbol]
+            mask ^= low
+        return result
+
+    def determinize(self, initial=None):
+        """Return the DFA of the subset construction, in compiled form
+
+        Subsets of NFA states are bitsets and get their ids from a dict, so
+        each (subset, symbol) pair costs one pass over the bits of the
+        subset plus a hash lookup. Like the classic construction, the empty
+        subset becomes a state when it is reached.
+
+        The initial subset is the closure of q0, unless another bitset is
+        given by initial.
+        """
+        k = len(self.symbols)
+        moves = self.moves()
+        if initial is None:
+            initial = self.closures()[self.q0]
+        index = {initial: 0}
+        subsets = [initial]
+        table = array('i')
+
+        i = 0
+        while i < len(subsets):
+            row = [0] * k
+            mask = subsets[i]
+            while mask:
+                low = mask & -mask
+                cell = (low.bit_length() - 1) * k
+                for symbol in range(k):
+                    row[symbol] |= moves[cell + symbol]
+                mask ^= low
+
+            for target in row:
+                state = index.get(target)
+                if state is None:
+                    state = len(subsets)
+                    index[target] = state
+                    subsets.append(target)
+                table.append(state)
+            i += 1
+
+        accepting_mask = self.accepting_mask()
+        accepting = bytearray(1 if s & accepting_mask else 0
+                              for s in subsets)
+        return CompiledAutomata(self.symbols, len(subsets), 0, accepting,
+                                table=table)
+
+    def accepts(self, word):
+        """Check if the word is accepted
+
+        The word is a string or any iterable of symbols. An NFA is simulated
+        with bitsets of states, without determinization.
+        """
+        return next(self.accepts_many([word]))
+
+    def accepts_many(self, words):
+        """Yield, for each word, if it is accepted
+
+        The lookup structures are fetched once and shared by every word, so
+        this is the way to check a big amount of words.
+        """
+        index = self.symbol_index
+        k = len(self.symbols)
+        if self.deterministic:
+            table = self.table
+            accepting = self.accepting
+            for word in words:
+                state = self.q0
+                for char in word:
+                    symbol = index.get(char)
+                    if symbol is None:
+                        break
+                    state = table[state * k + symbol]
+                    if state == NO_TRANSITION:
+                        break
+                else:
+                    yield bool(accepting[state])
+                    continue
+                yield False
+            return
+
+        initial = self.closures()[self.q0]
+        accepting = self.accepting_mask()
+        step = self.step
+        for word in words:
+            mask = initial
+            for char in word:
+                symbol = index.get(char)
+                if symbol is None:
+                    mask = 0
+                    break
+                mask = step(mask, symbol)
+                if not mask:
+                    break
+            yield bool(mask & accepting)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+from collections import deque
+
+from .compiled import NO_TRANSITION
+
+
+def accepted_word(compiled):
+    """Return a shortest word accepted by a compiled automata, or None
+
+    A breadth-first search from the closure of q0, where each state is
+    visited once and moves on epsilon cost nothing.
+    """
+    closures = compiled.closures()
+    k = len(compiled.symbols)
+    # state -> (previous state, symbol id), None for the states of q0
+    previous = {s: None for s in compiled.bits(closures[compiled.q0])}
+    queue = deque(previous)
+    while queue:
+        state = queue.popleft()
+        if compiled.accepting[state]:
+            return _word(compiled.symbols, previous, state)
+        for symbol in range(k):
+            for target in compiled.successors(state, symbol):
+                for reached in compiled.bits(closures[target]):
+                    if reached not in previous:
+                        previous[reached] = (state, symbol)
+                        queue.append(reached)
+    return None
+
+
+def _word(symbols, previous, node):
+    """Helper to the searches, return the word of the path to node"""
+    chars = []
+    while previous[node] is not None:
+        node, symbol = previous[node]
+        chars.append(symbols[symbol])
+    return ''.join(reversed(chars))
+
+
+def _subsets(compiled, symbols):
+    """Helper to the checks, the DFA of compiled run over symbols
+
+    Return the initial state, a function from a state and the id of a
+    symbol to the next state, and a function that checks a state is final.
+    A DFA keeps its state ids, with None as dead state. An NFA is run by
+    bitsets of states, where 0 is dead, as in the subset construction.
+    """
+    columns = [compiled.symbol_index.get(s) for s in symbols]
+    if compiled.deterministic:
+        table = compiled.table
+        accepting = compiled.accepting
+        k = len(compiled.symbols)
+
+        def step(state, symbol):
+            column = columns[symbol]
+            if state is None or column is None:
+                return None
+            target = table[state * k + column]
+            return None if target == NO_TRANSITION else target
+
+        def is_final(state):
+            return state is not None and bool(accepting[state])
+        return compiled.q0, step, is_final
+
+    mask = compiled.accepting_mask()
+
+    def step(state, symbol):
+        column = columns[symbol]
+        return 0 if column is None else compiled.step(state, column)
+
+    def is_final(state):
+        return bool(state & mask)
+    return compiled.closures()[compiled.q0], step, is_final
+
+
+def difference_word(first, second):
+    """Return a word accepted by only one of two compiled automatas, or None
+
+    The Hopcroft-Karp algorithm: pairs of states of the two DFAs are
+    visited breadth-first from the pair of initial states and merged in a
+    union-find. A pair already in the same set is known to be equivalent
+    and is not explored again, so at most as many pairs as states are
+    visited. The search stops at the first pair where one state is final
+    and the other is not. NFAs are determinized on the fly.
+    """
+    symbols = sorted(set(first.symbols) | set(second.symbols))
+    start, step, is_final = _subsets(first, symbols)
+    other_start, other_step, other_is_final = _subsets(second, symbols)
+
+    parent = {}
+
+    def find(node):
+        root = node
+        while root in parent:
+            root = parent[root]
+        while node != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    if is_final(start) != other_is_final(other_start):
+        return ''
+    pair = (start, other_start)
+    previous = {pair: None}
+    parent[(0, start)] = (1, other_start)
+    queue = deque([pair])
+    while queue:
+        pair = queue.popleft()
+        for symbol in range(len(symbols)):
+            target = (step(pair[0], symbol), other_step(pair[1], symbol))
+            root = find((0, target[0]))
+            other_root = find((1, target[1]))
+            if root == other_root:
+                continue
+            if is_final(target[0]) != other_is_final(target[1]):
+                return _word(symbols, previous, pair) + symbols[symbol]
+            parent[root] = other_root
+            previous[target] = (pair, symbol)
+            queue.append(target)
+    return None
+
+
+def not_included_word(first, second):
+    """Return a word accepted by first and not by second, or None
+
+    Antichain inclusion check: the search runs over pairs of a single state
+    of first and a state of the DFA of second, a subset of its states, so
+    only second is determinized, and only on the fly. A pair (s, S) is
+    dropped when a pair (s, T) with T a subset of S was already found,
+    since any word that leads from (s, S) to a counterexample does so from
+    (s, T) too. For each state of first, only the minimal subsets are kept.
+    When second is a DFA, its states are single ones and only the dead
+    state is a subset of another.
+    """
+    symbols = first.symbols
+    start, step, is_final = _subsets(second, symbols)
+    dead = None if second.deterministic else 0
+    moves = first.moves()
+    k = len(symbols)
+    minimal = {}  # state of first -> list of the minimal subsets found
+    previous = {}
+    queue = deque()
+
+    def add(pair, link):
+        if pair in previous or (pair[0], dead) in previous:
+            return
+        if not second.deterministic:
+            state, subset = pair
+            found = minimal.setdefault(state, [])
+            for other in found:
+                if other & subset == other:
+                    return
+            found[:] = [other for other in found if other & subset != subset]
+            found.append(subset)
+        previous[pair] = link
+        queue.append(pair)
+
+    for state in first.bits(first.closures()[first.q0]):
+        add((state, start), None)
+    while queue:
+        pair = queue.popleft()
+        state, subset = pair
+        if first.accepting[state] and not is_final(subset):
+            return _word(symbols, previous, pair)
+        for symbol in range(k):
+            reached = moves[state * k + symbol]
+            if reached:
+                target = step(subset, symbol)
+                for reached_state in first.bits(reached):
+                    add((reached_state, target), (pair, symbol))
+    return None
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import hashlib
+import sys
+from array import array
+
+from .compiled import CompiledAutomata, NO_TRANSITION
+from .minimization import canonical
+
+
+class FrozenAutomata:
+    """Immutable DFA, hashable by a canonical form
+
+    The DFA is kept in a private compiled form, with the table in a
+    memoryview of bytes and the final flags in bytes, so nothing can
+    change after it is made and it can be shared by threads. compile()
+    gives a new compiled automata over the same read-only parts.
+    Automatas derived from it by rename or restrict_to_reachable share the
+    same table memory, when the moves do not change.
+
+    Two frozen automatas are equal when their canonical forms are: the
+    states reached from q0, numbered breadth-first (see
+    minimization.canonical), their moves and final flags, and the symbols.
+    So state names and unreachable states do not matter.
+    """
+
+    __slots__ = ('_compiled', '_fingerprint')
+
+    def __init__(self, compiled):
+        if not compiled.deterministic:
+            raise Warning('Its necessary be a DFA to freeze.')
+
+        table = compiled.table
+        if not isinstance(table, memoryview) or \
+                not isinstance(table.obj, bytes):
+            # a read-only view of a mutable buffer could still change
+            table = memoryview(bytes(table)).cast('i')
+        frozen = CompiledAutomata(compiled.symbols, compiled.size,
+                                  compiled.q0, bytes(compiled.accepting),
+                                  table=table, states=compiled.states)
+        object.__setattr__(self, '_compiled', frozen)
+        object.__setattr__(self, '_fingerprint', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenAutomata is immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenAutomata is immutable.')
+
+    @classmethod
+    def _derived(cls, symbols, size, q0, accepting, table, states):
+        """Helper to make a frozen automata from frozen parts, with no copy"""
+        return cls(CompiledAutomata(symbols, size, q0, accepting,
+                                    table=table, states=states))
+
+    def compile(self):
+        """Return a compiled automata with the same read-only parts
+
+        It is a new object on each call, so changing it does not change
+        the frozen automata.
+        """
+        compiled = self._compiled
+        return CompiledAutomata(compiled.symbols, compiled.size, compiled.q0,
+                                compiled.accepting, table=compiled.table,
+                                states=compiled.states)
+
+    @property
+    def alphabet(self):
+        """Frozenset of the symbols"""
+        return frozenset(self._compiled.symbols)
+
+    @property
+    def states(self):
+        """Frozenset of the state names"""
+        return frozenset(self._compiled.states)
+
+    @property
+    def q0(self):
+        """Name of the initial state"""
+        return self._compiled.states[self._compiled.q0]
+
+    @property
+    def final_states(self):
+        """Frozenset of the final state names"""
+        compiled = self._compiled
+        return frozenset(compiled.states[s] for s in range(compiled.size)
+                         if compiled.accepting[s])
+
+    def fingerprint(self):
+        """Return the sha256, in hex, of the canonical form
+
+        It is computed once, in time linear in the size of the table.
+        """
+        if self._fingerprint is None:
+            form = canonical(self._compiled)
+            digest = hashlib.sha256()
+            digest.update('\0'.join(form.symbols).encode('utf-8') + b'\0\0')
+            digest.update(bytes(form.accepting))
+            if sys.byteorder != 'little':
+                form.table.byteswap()
+            digest.update(form.table.tobytes())
+            object.__setattr__(self, '_fingerprint', digest.hexdigest())
+        return self._fingerprint
+
+    def __hash__(self):
+        return int(self.fingerprint()[:16], 16)
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenAutomata):
+            return NotImplemented
+        return self is other or self.fingerprint() == other.fingerprint()
+
+    def __repr__(self):
+        return 'FrozenAutomata(%d states, %s)' % (self._compiled.size,
+                                                  self.fingerprint()[:12])
+
+    def accepts(self, word):
+        """Check if the word is accepted"""
+        return self._compiled.accepts(word)
+
+    def accepts_many(self, words):
+        """Yield, for each word, if it is accepted"""
+        return self._compiled.accepts_many(words)
+
+    def rename(self, names):
+        """Return the automata with states renamed by the dict names
+
+        States out of names keep their name. Only the names are new, the
+        table and the final flags are shared.
+        """
+        compiled = self._compiled
+        states = tuple(names.get(s, s) for s in compiled.states)
+        if len(set(states)) != len(states):
+            raise ValueError('Two states with the same name.')
+        return self._derived(compiled.symbols, compiled.size, compiled.q0,
+                             compiled.accepting, compiled.table, states)
+
+    def restrict_to_reachable(self):
+        """Return the automata without the states not reached from q0
+
+        When all states are reached, return self. When the reached ones
+        are the first ids, which is the case of automatas numbered
+        breadth-first, the result has a prefix of the same table.
+        Otherwise the reached states are renumbered in a new table.
+        """
+        compiled = self._compiled
+        reached = compiled.reachable()
+        size = reached.count(1)
+        if size == compiled.size:
+            return self
+
+        k = len(compiled.symbols)
+        if reached.find(0) == size:
+            return self._derived(compiled.symbols, size, compiled.q0,
+                                 compiled.accepting[:size],
+                                 compiled.table[:size * k],
+                                 compiled.states[:size])
+
+        order = [s for s in range(compiled.size) if reached[s]]
+        number = array('i', [NO_TRANSITION]) * compiled.size
+        for new, old in enumerate(order):
+            number[old] = new
+        table = array('i')
+        for old in order:
+            for target in compiled.table[old * k:(old + 1) * k]:
+                table.append(number[target]
+                             if target != NO_TRANSITION else NO_TRANSITION)
+        return self._derived(compiled.symbols, size, number[compiled.q0],
+                             bytes(compiled.accepting[s] for s in order),
+                             memoryview(table.tobytes()).cast('i'),
+                             [compiled.states[s] for s in order])
+
+    def thaw(self):
+        """Return a mutable Automata with the same states and moves"""
+        from .automata import Automata
+        return Automata.from_compiled(self.compile())
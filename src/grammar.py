@@ -11,16 +11,30 @@ Alunos:
 - Gabriel Leal Chittolina Amaral
 - Lucas João Martins
 """
-import json
 
+from array import array
+from collections import namedtuple
+
+from . import jsonio
+from .compiled import CompiledAutomata, components
+from .lazy import LazyDFA
 from .utils import Utils
 
 
+END = -1  # id of the new final state, where a word may stop
+SIMPLIFICATION = namedtuple('Simplification', [
+    'unit_productions', 'unproductive', 'unreachable', 'before', 'after'])
+
+
 class Grammar:
     """Representation of a grammar
 
     Assumes each production "A -> aB", where B is optional, is of the form:
     ("A", "a"[, "B"])
+
+    The productions are also indexed: nonterminals and terminals are
+    interned to ints, with the initial symbol as 0, and the productions of
+    each nonterminal are grouped by terminal. The body of "A -> a" is END.
     """
 
     def __init__(self, productions, initial_symbol):
@@ -30,12 +44,111 @@ class Grammar:
         """
         self._initial_symbol = initial_symbol
         self._productions = set(productions)
-        self._nonterminals = self._get_nonterminals()
-        self._terminals = self._get_terminals()
+        self._index()
+        self._compiled = None
+        self._matcher = None
+
+    def _index(self):
+        """Helper to grammar constructor, read the productions once
+
+        Define the sets of nonterminals and terminals and the index:
+        - _nonterminal_names and _terminal_names, the name of each id;
+        - _rows, for each nonterminal, a dict of each terminal id to the
+        list of bodies of its productions;
+        - _epsilon, for each nonterminal, the list of bodies of the
+        productions on &.
+        """
+        nonterminal_ids = {self._initial_symbol: 0}
+        terminal_ids = {}
+        rows = [{}]
+        epsilon = [[]]
+
+        def intern(name):
+            number = nonterminal_ids.get(name)
+            if number is None:
+                number = nonterminal_ids[name] = len(rows)
+                rows.append({})
+                epsilon.append([])
+            return number
+
+        for production in self._productions:
+            head = intern(production[0])
+            body = intern(production[2]) if len(production) == 3 else END
+            if production[1] == Utils.EPSILON:
+                epsilon[head].append(body)
+                continue
+            terminal = terminal_ids.get(production[1])
+            if terminal is None:
+                terminal = terminal_ids[production[1]] = len(terminal_ids)
+            rows[head].setdefault(terminal, []).append(body)
+
+        self._nonterminal_names = list(nonterminal_ids)
+        self._terminal_names = list(terminal_ids)
+        self._rows = rows
+        self._epsilon = epsilon
+        self._nonterminals = set(nonterminal_ids)
+        self._terminals = set(terminal_ids)
+
+    def compile(self):
+        """Return the NFA of the grammar in compiled form
+
+        It is built once from the index: a state for each nonterminal, with
+        the same id, and a last final state for END. Used by generates.
+        """
+        if self._compiled is None:
+            final = len(self._rows)
+
+            def state(body):
+                return final if body == END else body
+
+            k = len(self._terminal_names)
+            targets = []
+            for row in self._rows:
+                for terminal in range(k):
+                    targets.append(tuple(map(state, row.get(terminal, ()))))
+            targets.extend([()] * k)
+            epsilon = [tuple(map(state, bodies)) for bodies in self._epsilon]
+            epsilon.append(())
+            accepting = bytearray(final + 1)
+            accepting[final] = 1
+            self._compiled = CompiledAutomata.from_cells(
+                self._terminal_names, final + 1, 0, accepting, targets,
+                epsilon, self._nonterminal_names + [Utils.NEW_FINAL_STATE])
+        return self._compiled
+
+    def generates(self, word):
+        """Check if the word is generated by the grammar
+
+        The word is a string or any iterable of terminals.
+        """
+        return next(self.generates_many([word]))
+
+    def generates_many(self, words):
+        """Yield, for each word of the iterable, if it is generated
 
-    def to_automaton(self):
-        """Return an automata from the self grammar"""
+        The words run over a LazyDFA of the compiled grammar, kept by the
+        grammar, so the sets of nonterminals reached and their moves are
+        computed once for all words and all calls, up to the cache size.
+        """
+        if self._matcher is None:
+            self._matcher = LazyDFA(self.compile())
+        return self._matcher.accepts_many(words)
+
+    def to_automaton(self, simplify=False):
+        """Return an automata from the self grammar
+
+        With simplify, the grammar is simplified before (see simplify). When
+        nothing is left, the language is empty and the result is the initial
+        symbol alone, not final and with no moves, as in to_dfa.
+        """
         from .automata import Automata
+        if simplify:
+            simplified = self.simplify()[0]
+            if not simplified._productions:
+                q0 = self._initial_symbol
+                return Automata(set(), {q0}, q0, set(), {},
+                                validation='trusted')
+            return simplified.to_automaton()
         transitions = self._make_transitions()
         final_states = set(Utils.NEW_FINAL_STATE)
         q0 = self._initial_symbol
@@ -43,37 +156,177 @@ class Grammar:
         alphabet = self._terminals
         return Automata(alphabet, states, q0, final_states, transitions)
 
-    def save_json(self, filename):
+    def to_dfa(self, simplify=False):
+        """Return a DFA from the self grammar, with no NFA in between
+
+        The subset construction runs over the index: a DFA state is the set
+        of nonterminals that may derive the rest of the word, with END once
+        the word may stop, closed by the productions on &. States are named
+        'qi' by order of discovery and the empty set is kept as a dead
+        state, so the DFA is complete.
+
+        With simplify, the grammar is simplified before (see simplify).
+        """
+        from .automata import Automata
+        if simplify:
+            return self.simplify()[0].to_dfa()
+        columns = sorted(range(len(self._terminal_names)),
+                         key=self._terminal_names.__getitem__)
+        rows = self._rows
+
+        start = self._close([0])
+        ids = {start: 0}
+        subsets = [start]
+        table = array('i')
+        for subset in subsets:
+            moves = {}
+            for head in subset:
+                if head != END:
+                    for terminal, bodies in rows[head].items():
+                        moves.setdefault(terminal, []).extend(bodies)
+            for terminal in columns:
+                target = self._close(moves.get(terminal, ()))
+                target_id = ids.get(target)
+                if target_id is None:
+                    target_id = ids[target] = len(subsets)
+                    subsets.append(target)
+                table.append(target_id)
+
+        accepting = bytearray(END in subset for subset in subsets)
+        symbols = [self._terminal_names[t] for t in columns]
+        return Automata.from_compiled(CompiledAutomata(
+            symbols, len(subsets), 0, accepting, table=table))
+
+    def simplify(self):
+        """Return an equivalent grammar without useless parts, and a report
+
+        The grammar is simplified in three passes over the index:
+        1. unit productions "A -> &B" are collapsed: A gets the other
+        productions of each nonterminal it reaches by unit productions;
+        2. productive fixpoint: a nonterminal is productive when it has a
+        production with no body or with a productive body. Productions of
+        or to the other ones are removed;
+        3. reachable fixpoint: nonterminals not reached from the initial
+        symbol are removed, with their productions.
+
+        The passes 2 and 3 run over reversed and forward lists of bodies,
+        in time linear in the productions. Pass 1 runs over the strongly
+        connected components of the unit productions (see
+        compiled.components), in reverse topological order: the collapsed
+        productions of a component are the ones of its members plus the
+        ones of the components they reach, already done, and are shared by
+        all members. So each is computed once, but pass 1 still costs the
+        size of its result, which is quadratic for a chain of unit
+        productions "A1 -> &A2 ... -> &An" where each Ai has its own
+        productions.
+
+        The report is a SIMPLIFICATION with the number of unit productions
+        collapsed, the sets of unproductive and unreachable nonterminals
+        and the number of productions before and after.
+        """
+        size = len(self._rows)
+        units = [[body for body in bodies if body != END]
+                 for bodies in self._epsilon]
+
+        productions = set()  # of (head, terminal id or None, body)
+        component = [-1] * size
+        collapsed = []  # of each component, set of (terminal or None, body)
+        for current, members in enumerate(components(size, units)):
+            for member in members:
+                component[member] = current
+            moves = set()
+            for member in members:
+                for terminal, bodies in self._rows[member].items():
+                    moves.update((terminal, body) for body in bodies)
+                if END in self._epsilon[member]:
+                    moves.add((None, END))
+                for body in units[member]:
+                    if component[body] != current:
+                        moves |= collapsed[component[body]]
+            collapsed.append(moves)
+            for member in members:
+                productions.update((member, terminal, body)
+                                   for terminal, body in moves)
+
+        heads = [[] for _ in range(size)]  # heads of each body
+        productive = bytearray(size)
+        stack = []
+        for head, _, body in productions:
+            if body == END:
+                if not productive[head]:
+                    productive[head] = 1
+                    stack.append(head)
+            else:
+                heads[body].append(head)
+        while stack:
+            for head in heads[stack.pop()]:
+                if not productive[head]:
+                    productive[head] = 1
+                    stack.append(head)
+
+        bodies = [[] for _ in range(size)]
+        for head, _, body in productions:
+            if body != END and productive[head] and productive[body]:
+                bodies[head].append(body)
+        reachable = bytearray(size)
+        stack = [0] if productive[0] else []
+        if stack:
+            reachable[0] = 1
+        while stack:
+            for body in bodies[stack.pop()]:
+                if not reachable[body]:
+                    reachable[body] = 1
+                    stack.append(body)
+
+        names = self._nonterminal_names
+        terminals = self._terminal_names
+        simplified = []
+        for head, terminal, body in productions:
+            if reachable[head] and (body == END or productive[body]):
+                char = Utils.EPSILON if terminal is None else \
+                    terminals[terminal]
+                if body == END:
+                    simplified.append((names[head], char))
+                else:
+                    simplified.append((names[head], char, names[body]))
+
+        report = SIMPLIFICATION(
+            sum(len(bodies) for bodies in units),
+            {names[n] for n in range(size) if not productive[n]},
+            {names[n] for n in range(size)
+             if productive[n] and not reachable[n]},
+            len(self._productions), len(simplified))
+        return Grammar(simplified, self._initial_symbol), report
+
+    def _close(self, heads):
+        """Helper to to_dfa, return the heads and what they reach on &"""
+        closed = set(heads)
+        stack = [head for head in closed if head != END]
+        while stack:
+            for body in self._epsilon[stack.pop()]:
+                if body not in closed:
+                    closed.add(body)
+                    if body != END:
+                        stack.append(body)
+        return frozenset(closed)
+
+    def save_json(self, filename, compact=False):
         """Save in filesystem a json file from a grammar
 
         The path in filename don't need contain the '.json' extension.
+
+        The productions are written one by one (see jsonio.dump_object).
+        With compact, there is no indentation or spaces.
         """
-        data = {
-            'nonterminals': list(self._nonterminals),
-            'terminals': list(self._terminals),
-            'productions': list(self._productions),
-            'initial_symbol': self._initial_symbol
-        }
+        members = [
+            ('nonterminals', list(self._nonterminals)),
+            ('terminals', list(self._terminals)),
+            ('productions', jsonio.STREAMED_ARRAY(self._productions)),
+            ('initial_symbol', self._initial_symbol)
+        ]
         with open(filename + '.json', 'w') as write_file:
-            json.dump(data, write_file, indent=4)
-
-    def _get_nonterminals(self):
-        """Helper to grammar constructor"""
-        nonterminals = set()
-        nonterminals.add(self._initial_symbol)
-        for production in self._productions:
-            nonterminals.add(production[0])
-            if len(production) == 3:
-                nonterminals.add(production[2])
-        return nonterminals
-
-    def _get_terminals(self):
-        """Helper to grammar constructor"""
-        terminals = set()
-        for production in self._productions:
-            if production[1] != Utils.EPSILON:
-                terminals.add(production[1])
-        return terminals
+            jsonio.dump_object(write_file, members,
+                               indent=None if compact else 4)
 
     def _make_transitions(self):
         """Helper to conversion from a grammar to an automata"""
@@ -81,7 +334,7 @@ class Grammar:
         for production in self._productions:
             src = Utils.TRANSITION(production[0], production[1])
             output = self._get_next_state(production)
-            self._include_transition(transitions, src, output)
+            transitions.setdefault(src, set()).add(output)
         return transitions
 
     def _get_next_state(self, production):
@@ -90,20 +343,25 @@ class Grammar:
             return production[2]
         return Utils.NEW_FINAL_STATE
 
-    def _include_transition(self, transitions, src, output):
-        """Helper to conversion from a grammar to an automata"""
-        if src not in transitions.keys():
-            transitions[src] = list()
-        transitions[src].append(output)
-
     @staticmethod
-    def read_from_json(filename):
+    def read_from_json(filename, validate=False):
         """Return an grammar from a json file
 
         The path in filename don't need contain the '.json' extension.
+
+        The file is read by chunks and each production goes to the set as
+        soon as it is read (see jsonio.load_object). With validate, each
+        production is checked as it is read.
         """
+        productions = set()
+
+        def add_production(production):
+            if validate:
+                jsonio.check_production(production)
+            productions.add(tuple(production))
+
         with open(filename + '.json', 'r') as read_file:
-            data = json.load(read_file)
-        productions = [tuple(production) for production in data['productions']]
+            data = jsonio.load_object(read_file,
+                                      {'productions': add_production})
         initial_symbol = data['initial_symbol']
         return Grammar(productions, initial_symbol)
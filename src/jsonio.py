@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import json
+import re
+from collections import namedtuple
+
+from .utils import Utils
+
+CHUNK_SIZE = 1 << 16
+_SPACES = re.compile(r'[ \t\n\r]*')
+
+
+class _Reader:
+    """Helper to load_object, a JSON text read from a file by chunks"""
+
+    def __init__(self, read_file, chunk_size):
+        self._file = read_file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read at least a chunk, dropping what was already consumed
+
+        The size read grows with the buffer, so a value larger than a
+        chunk is decoded again only a logarithmic number of times.
+        """
+        size = max(self._chunk_size, len(self.buffer) - self.pos)
+        chunk = self._file.read(size)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        """Return the next char that is not a space, or '' at the end"""
+        while True:
+            buffer = self.buffer
+            pos = _SPACES.match(buffer, self.pos).end()
+            self.pos = pos
+            if pos < len(buffer) or self.eof:
+                return buffer[pos:pos + 1]
+            self.fill()
+
+    def expect(self, chars):
+        """Consume and return the next char, that must be one of chars"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError('Invalid json file.')
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode and return the next value
+
+        A value is only taken when some char follows it in the buffer, so a
+        number cut by the end of a chunk is never read in half.
+        """
+        while True:
+            self.peek()
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def load_object(read_file, handlers, chunk_size=CHUNK_SIZE):
+    """Return the object of a JSON file, streaming the values of some keys
+
+    The file is read by chunks of chunk_size chars. The value of a key in
+    handlers must be an array or an object: it is never decoded whole,
+    each element of an array, or each member of an object as a tuple
+    (name, value), is decoded and passed to handlers[key] alone, so the
+    peak memory is the one of a single element. These keys are left out of
+    the result and the other ones are decoded as json.load does.
+    """
+    reader = _Reader(read_file, chunk_size)
+    reader.expect('{')
+    data = {}
+    if reader.peek() == '}':
+        reader.pos += 1
+        return data
+
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError('Invalid json file.')
+        reader.expect(':')
+        if key in handlers:
+            _load_items(reader, handlers[key])
+        else:
+            data[key] = reader.value()
+        if reader.expect(',}') == '}':
+            return data
+
+
+def _load_items(reader, handler):
+    """Helper to load_object, pass each item of an array or object"""
+    close = ']' if reader.expect('[{') == '[' else '}'
+    if reader.peek() == close:
+        reader.pos += 1
+        return
+    while True:
+        if close == ']':
+            handler(reader.value())
+        else:
+            name = reader.value()
+            if not isinstance(name, str):
+                raise ValueError('Invalid json file.')
+            reader.expect(':')
+            handler((name, reader.value()))
+        if reader.expect(',' + close) == close:
+            return
+
+
+STREAMED_ARRAY = namedtuple('StreamedArray', ['items'])
+STREAMED_OBJECT = namedtuple('StreamedObject', ['items'])
+
+
+def dump_object(write_file, members, indent=None):
+    """Write a json object member by member
+
+    members is an iterable of (name, value). A value wrapped in
+    STREAMED_ARRAY (an iterable of elements) or STREAMED_OBJECT (an
+    iterable of (name, value)) is written one item at a time, as it is
+    produced, and the other values are written by json.dumps. With an
+    indent, the output is the same of json.dump, and without it the output
+    is compact, with no spaces or new lines.
+    """
+    _dump_items(write_file.write, members, indent, 0, True)
+
+
+def _dump_items(write, items, indent, level, members):
+    """Helper to dump_object, write an array or, with members, an object"""
+    if indent is None:
+        start = end = ''
+        colon = ':'
+    else:
+        start = '\n' + ' ' * indent * (level + 1)
+        end = '\n' + ' ' * indent * level
+        colon = ': '
+    write('{' if members else '[')
+    empty = True
+    for item in items:
+        write(start if empty else ',' + start)
+        empty = False
+        if members:
+            name, item = item
+            write(json.dumps(name) + colon)
+        if isinstance(item, STREAMED_ARRAY):
+            _dump_items(write, item.items, indent, level + 1, False)
+        elif isinstance(item, STREAMED_OBJECT):
+            _dump_items(write, item.items, indent, level + 1, True)
+        elif indent is None:
+            write(json.dumps(item, separators=(',', ':')))
+        else:
+            write(json.dumps(item, indent=indent).replace(
+                '\n', '\n' + ' ' * indent * (level + 1)))
+    if not empty:
+        write(end)
+    write('}' if members else ']')
+
+
+def transitions_of(element):
+    """Yield the transitions of an element of 'transitions'
+
+    The transitions can be a list of [state, symbol, [states]] or grouped
+    by state, as {state: {symbol: [states]}}. In the second layout, an
+    element is a tuple (state, row), see load_object, and it has one
+    transition by symbol of the row.
+    """
+    if not isinstance(element, tuple):
+        yield element
+        return
+    state, row = element
+    if not isinstance(row, dict):
+        raise ValueError('Invalid transition in json file: '
+                         + json.dumps(element))
+    for symbol, targets in row.items():
+        yield [state, symbol, targets]
+
+
+def is_transition(element):
+    """Check if an element of 'transitions' is [state, symbol, [states]]"""
+    return isinstance(element, list) and len(element) == 3 and \
+        isinstance(element[0], str) and isinstance(element[1], str) and \
+        isinstance(element[2], list) and \
+        all(isinstance(state, str) for state in element[2])
+
+
+def is_production(element):
+    """Check if an element of 'productions' is [head, terminal[, body]]"""
+    return isinstance(element, list) and len(element) in (2, 3) and \
+        all(isinstance(symbol, str) for symbol in element)
+
+
+def check_transition(element):
+    """Raise ValueError if an element of 'transitions' is malformed"""
+    if not is_transition(element):
+        raise ValueError('Invalid transition in json file: '
+                         + json.dumps(element))
+
+
+def check_production(element):
+    """Raise ValueError if an element of 'productions' is malformed"""
+    if not is_production(element):
+        raise ValueError('Invalid production in json file: '
+                         + json.dumps(element))
+
+
+def check_declared(data, states, symbols):
+    """Raise ValueError if the transitions use undeclared names
+
+    states and symbols are the names used by the transitions, data is the
+    rest of the file, with the declared 'states' and 'alphabet'. Epsilon
+    is always a valid symbol.
+    """
+    if not set(states).issubset(data.get('states', ())):
+        raise ValueError('Transition with an unknown state.')
+    if not (set(symbols) - {Utils.EPSILON}).issubset(
+            data.get('alphabet', ())):
+        raise ValueError('Transition with an unknown symbol.')
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+from collections import OrderedDict
+
+
+class LazyDFA:
+    """DFA of an NFA, built on the fly while words are matched
+
+    Each DFA state is a bitset of NFA states, as in the subset construction,
+    but a state and its moves are only computed when a word reaches them.
+    Computed states are kept in a cache bounded by max_states. When it is
+    full, the least recently used state is evicted and will be computed
+    again if some word reaches it later.
+    """
+
+    MAX_STATES = 10000
+
+    def __init__(self, compiled, max_states=MAX_STATES):
+        if max_states < 1:
+            raise ValueError('The cache must hold at least one state.')
+
+        self._nfa = compiled
+        self.max_states = max_states
+        self.initial = compiled.closures()[compiled.q0]
+        self._accepting = compiled.accepting_mask()
+        # bitset -> list with the target bitset of each symbol, or None
+        self._cache = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self):
+        """Return the number of DFA states in the cache"""
+        return len(self._cache)
+
+    def next_state(self, state, symbol):
+        """Return the DFA state reached from state by the symbol id"""
+        cache = self._cache
+        row = cache.get(state)
+        if row is None:
+            row = [None] * len(self._nfa.symbols)
+            cache[state] = row
+            if len(cache) > self.max_states:
+                cache.popitem(last=False)
+                self.evictions += 1
+        else:
+            cache.move_to_end(state)
+
+        target = row[symbol]
+        if target is None:
+            target = self._nfa.step(state, symbol)
+            row[symbol] = target
+        return target
+
+    def is_final(self, state):
+        """Check if the DFA state has some final NFA state"""
+        return bool(state & self._accepting)
+
+    def accepts(self, word):
+        """Check if the word is accepted"""
+        return next(self.accepts_many([word]))
+
+    def accepts_many(self, words):
+        """Yield, for each word, if it is accepted
+
+        The cache is shared by all words, so states reached by a word are
+        usually already built for the next ones.
+        """
+        index = self._nfa.symbol_index
+        next_state = self.next_state
+        for word in words:
+            state = self.initial
+            for char in word:
+                symbol = index.get(char)
+                if symbol is None:
+                    state = 0
+                    break
+                state = next_state(state, symbol)
+                if not state:
+                    break
+            yield self.is_final(state)
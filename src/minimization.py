@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+from array import array
+
+from .compiled import CompiledAutomata, NO_TRANSITION
+
+
+def hopcroft(compiled, include=None, accepting=None):
+    """Return the partition of the states of a DFA by the Hopcroft's algorithm
+
+    Only states flagged in include take part; they must be closed under the
+    moves. A missing move goes to a dead state with the id compiled.size.
+    The result is the tuple (block, count), where block[s] is the block id
+    of the state s, or NO_TRANSITION when s is left out.
+
+    The partition is kept in the array elems, where each block is a range
+    [first[b], end[b]) and loc[s] is the position of s. Predecessors come
+    from inverse transitions grouped by (symbol, target), so each splitter
+    (block, symbol) costs the number of its incoming moves. The state set
+    of a split that gets the id of a new block is always the smaller half,
+    which is the only one relabeled and put in the work list. That gives
+    the O(n.k.log n) bound.
+    """
+    table, size = compiled.completed_table(compiled.symbols)
+    k = len(compiled.symbols)
+    include = bytearray(include if include is not None
+                        else [1] * compiled.size)
+    accepting = bytearray(accepting if accepting is not None
+                          else compiled.accepting)
+    if size > compiled.size:
+        include.append(1)
+        accepting.append(0)
+    states = [s for s in range(size) if include[s]]
+
+    # inverse transitions, in compressed rows indexed by symbol * size + t
+    offsets = array('i', [0]) * (k * size + 1)
+    for state in states:
+        row = state * k
+        for symbol in range(k):
+            offsets[symbol * size + table[row + symbol] + 1] += 1
+    for key in range(k * size):
+        offsets[key + 1] += offsets[key]
+    fill = array('i', offsets)
+    predecessors = array('i', [0]) * offsets[-1]
+    for state in states:
+        row = state * k
+        for symbol in range(k):
+            key = symbol * size + table[row + symbol]
+            predecessors[fill[key]] = state
+            fill[key] += 1
+
+    # initial partition: final and nonfinal states
+    elems = array('i')
+    first = []
+    end = []
+    block = array('i', [NO_TRANSITION]) * size
+    for group in ([s for s in states if accepting[s]],
+                  [s for s in states if not accepting[s]]):
+        if group:
+            for state in group:
+                block[state] = len(first)
+            first.append(len(elems))
+            elems.extend(group)
+            end.append(len(elems))
+    loc = array('i', [0]) * size
+    for position, state in enumerate(elems):
+        loc[state] = position
+    marked = [0] * len(first)
+
+    work = []
+    if len(first) == 2:
+        smaller = 0 if end[0] - first[0] <= end[1] - first[1] else 1
+        work.extend(smaller * k + symbol for symbol in range(k))
+
+    while work:
+        item = work.pop()
+        splitter, symbol = divmod(item, k)
+
+        # mark the predecessors, moving them to the front of their block
+        touched = []
+        for target in elems[first[splitter]:end[splitter]]:
+            key = symbol * size + target
+            for i in range(offsets[key], offsets[key + 1]):
+                state = predecessors[i]
+                b = block[state]
+                m = marked[b]
+                if not m:
+                    touched.append(b)
+                position = first[b] + m
+                other = elems[position]
+                elems[position] = state
+                elems[loc[state]] = other
+                loc[other] = loc[state]
+                loc[state] = position
+                marked[b] = m + 1
+
+        for b in touched:
+            m = marked[b]
+            marked[b] = 0
+            if m == end[b] - first[b]:
+                continue
+
+            # the smaller half becomes the new block c
+            c = len(first)
+            middle = first[b] + m
+            if m <= end[b] - middle:
+                first.append(first[b])
+                end.append(middle)
+                first[b] = middle
+            else:
+                first.append(middle)
+                end.append(end[b])
+                end[b] = middle
+            marked.append(0)
+            for position in range(first[c], end[c]):
+                block[elems[position]] = c
+
+            # if (b, a) is waiting, both halves are now covered by it and
+            # (c, a); if not, (c, a) is the smaller half. Either way, only
+            # (c, a) goes to the work list
+            work.extend(c * k + a for a in range(k))
+
+    return block, len(first)
+
+
+def quotient(compiled, block, count):
+    """Return the compiled DFA whose states are the blocks of a partition
+
+    Blocks are numbered in the breadth-first order they are reached from
+    the block of q0, so equal languages give equal tables. Blocks that are
+    not reached are dropped.
+    """
+    table, size = compiled.completed_table(compiled.symbols)
+    k = len(compiled.symbols)
+    accepting = bytearray(compiled.accepting)
+    accepting.extend(bytes(size - compiled.size))
+
+    # a representative state of each block
+    representative = [NO_TRANSITION] * count
+    for state in range(size):
+        if block[state] != NO_TRANSITION and \
+           representative[block[state]] == NO_TRANSITION:
+            representative[block[state]] = state
+
+    number = [NO_TRANSITION] * count
+    number[block[compiled.q0]] = 0
+    order = [block[compiled.q0]]
+    new_table = array('i')
+    for b in order:
+        row = representative[b] * k
+        for symbol in range(k):
+            target = block[table[row + symbol]]
+            if number[target] == NO_TRANSITION:
+                number[target] = len(order)
+                order.append(target)
+            new_table.append(number[target])
+
+    new_accepting = bytearray(accepting[representative[b]] for b in order)
+    return CompiledAutomata(compiled.symbols, len(order), 0, new_accepting,
+                            table=new_table)
+
+
+def reverse(compiled):
+    """Return the compiled NFA of the reverse language
+
+    Every move is reversed. A new initial state, with the id compiled.size,
+    moves by epsilon to the old final states, and the old q0 is the only
+    final state.
+    """
+    k = len(compiled.symbols)
+    size = compiled.size + 1
+    targets = [[] for _ in range(size * k)]
+    epsilon = [[] for _ in range(size)]
+    for state in range(compiled.size):
+        for symbol in range(k):
+            for target in compiled.successors(state, symbol):
+                targets[target * k + symbol].append(state)
+        for target in compiled.epsilon_successors(state):
+            epsilon[target].append(state)
+    epsilon[compiled.size] = [s for s in range(compiled.size)
+                              if compiled.accepting[s]]
+
+    accepting = bytearray(size)
+    accepting[compiled.q0] = 1
+    return CompiledAutomata(compiled.symbols, size, compiled.size, accepting,
+                            targets=[tuple(t) for t in targets],
+                            epsilon=[tuple(t) for t in epsilon])
+
+
+def brzozowski(compiled):
+    """Return the minimal DFA by the Brzozowski's algorithm
+
+    Reverse, determinize, reverse and determinize again. Works from an NFA
+    as well, since the first determinization already makes a DFA.
+    """
+    return _determinize_reverse(_determinize_reverse(compiled))
+
+
+def _determinize_reverse(compiled):
+    """Helper to brzozowski, determinize the reverse of an automata
+
+    The subset construction starts from the closure of the old final
+    states, so the extra initial state of the reverse, that is never
+    reached again, does not take part in the subsets.
+    """
+    nfa = reverse(compiled)
+    closures = nfa.closures()
+    initial = 0
+    for state in range(compiled.size):
+        if compiled.accepting[state]:
+            initial |= closures[state]
+    return nfa.determinize(initial)
+
+
+class _Partition:
+    """Refinable partition used by the Valmari-Lehtinen's algorithm
+
+    Sets are ranges [first[s], past[s]) of elems, loc[e] is the position of
+    the element e and sid[e] its set. Marked elements are moved to the
+    front of their set, and split() makes a new set from the smaller of the
+    marked and unmarked parts of each touched set.
+    """
+
+    __slots__ = ('elems', 'loc', 'sid', 'first', 'past', 'marked',
+                 'touched', 'count')
+
+    def __init__(self, size):
+        self.elems = array('i', range(size))
+        self.loc = array('i', range(size))
+        self.sid = array('i', [0]) * size
+        self.first = [0]
+        self.past = [size]
+        self.marked = [0]
+        self.touched = []
+        self.count = 1 if size else 0
+
+    def mark(self, e):
+        s = self.sid[e]
+        i = self.loc[e]
+        j = self.first[s] + self.marked[s]
+        self.elems[i] = self.elems[j]
+        self.loc[self.elems[i]] = i
+        self.elems[j] = e
+        self.loc[e] = j
+        if not self.marked[s]:
+            self.touched.append(s)
+        self.marked[s] += 1
+
+    def split(self):
+        while self.touched:
+            s = self.touched.pop()
+            j = self.first[s] + self.marked[s]
+            self.marked[s] = 0
+            if j == self.past[s]:
+                continue
+
+            z = self.count
+            if j - self.first[s] <= self.past[s] - j:
+                self.first.append(self.first[s])
+                self.past.append(j)
+                self.first[s] = j
+            else:
+                self.first.append(j)
+                self.past.append(self.past[s])
+                self.past[s] = j
+            self.marked.append(0)
+            for i in range(self.first[z], self.past[z]):
+                self.sid[self.elems[i]] = z
+            self.count += 1
+
+
+def valmari(compiled):
+    """Return the minimal partial DFA by the Valmari-Lehtinen's algorithm
+
+    Blocks of states and cords of transitions are refined against each
+    other, so a DFA with missing moves is minimized as it is, in
+    O(m.log n) for m transitions, without completing it with a dead state.
+    States unreachable from q0 or that cannot reach a final state are
+    removed first, so the result has no dead state either. When that
+    removes q0, the language is empty and the result is q0 alone, not
+    final and with no moves.
+    """
+    if not compiled.deterministic:
+        raise Warning('Its necessary be a DFA to make minimization.')
+
+    k = len(compiled.symbols)
+    table = compiled.table
+    tails = array('i')
+    labels = array('i')
+    heads = array('i')
+    for state in range(compiled.size):
+        for symbol in range(k):
+            target = table[state * k + symbol]
+            if target != NO_TRANSITION:
+                tails.append(state)
+                labels.append(symbol)
+                heads.append(target)
+
+    # relevant states: reachable from q0 and reaching a final state
+    forward = compiled.reachable()
+    backward = bytearray(compiled.accepting)
+    stack = [s for s in range(compiled.size) if backward[s]]
+    incoming = [[] for _ in range(compiled.size)]
+    for t in range(len(tails)):
+        incoming[heads[t]].append(t)
+    while stack:
+        for t in incoming[stack.pop()]:
+            if not backward[tails[t]]:
+                backward[tails[t]] = 1
+                stack.append(tails[t])
+    relevant = [s for s in range(compiled.size)
+                if forward[s] and backward[s]]
+    if not backward[compiled.q0]:
+        return CompiledAutomata(compiled.symbols, 1, 0, bytearray(1),
+                                table=array('i', [NO_TRANSITION]) * k)
+
+    # renumber relevant states and keep only their transitions
+    number = array('i', [NO_TRANSITION]) * compiled.size
+    for i, state in enumerate(relevant):
+        number[state] = i
+    kept = [t for t in range(len(tails))
+            if number[tails[t]] != NO_TRANSITION and
+            number[heads[t]] != NO_TRANSITION]
+    tails = array('i', (number[tails[t]] for t in kept))
+    heads = array('i', (number[heads[t]] for t in kept))
+    labels = array('i', (labels[t] for t in kept))
+    size = len(relevant)
+    m = len(kept)
+
+    # initial partition of states: final and nonfinal
+    blocks = _Partition(size)
+    for i, state in enumerate(relevant):
+        if compiled.accepting[state]:
+            blocks.mark(i)
+    blocks.split()
+
+    # initial partition of transitions: one cord per label
+    cords = _Partition(m)
+    if m:
+        order = sorted(range(m), key=labels.__getitem__)
+        cords.elems = array('i', order)
+        cords.first = []
+        cords.past = []
+        cords.marked = []
+        for i, t in enumerate(order):
+            cords.loc[t] = i
+            if not i or labels[t] != labels[order[i - 1]]:
+                if i:
+                    cords.past.append(i)
+                cords.first.append(i)
+                cords.marked.append(0)
+            cords.sid[t] = len(cords.first) - 1
+        cords.past.append(m)
+        cords.count = len(cords.first)
+
+    # incoming transitions of each state, grouped by head
+    adjacent = [[] for _ in range(size)]
+    for t in range(m):
+        adjacent[heads[t]].append(t)
+
+    b = 1
+    c = 0
+    while c < cords.count:
+        for i in range(cords.first[c], cords.past[c]):
+            blocks.mark(tails[cords.elems[i]])
+        blocks.split()
+        c += 1
+        while b < blocks.count:
+            for i in range(blocks.first[b], blocks.past[b]):
+                for t in adjacent[blocks.elems[i]]:
+                    cords.mark(t)
+            cords.split()
+            b += 1
+
+    # build the quotient, numbering blocks breadth-first from q0
+    accepting = bytearray(blocks.count)
+    block_table = array('i', [NO_TRANSITION]) * (blocks.count * k)
+    for i, state in enumerate(relevant):
+        if compiled.accepting[state]:
+            accepting[blocks.sid[i]] = 1
+    for t in range(m):
+        block_table[blocks.sid[tails[t]] * k + labels[t]] = \
+            blocks.sid[heads[t]]
+    return canonical(CompiledAutomata(
+        compiled.symbols, blocks.count, blocks.sid[number[compiled.q0]],
+        accepting, table=block_table))
+
+
+def canonical(compiled):
+    """Return a DFA with states numbered breadth-first from q0
+
+    Symbols are taken in their order, missing moves are kept missing and
+    states not reached are dropped.
+    """
+    k = len(compiled.symbols)
+    number = array('i', [NO_TRANSITION]) * compiled.size
+    number[compiled.q0] = 0
+    order = [compiled.q0]
+    table = array('i')
+    for state in order:
+        for symbol in range(k):
+            target = compiled.table[state * k + symbol]
+            if target != NO_TRANSITION:
+                if number[target] == NO_TRANSITION:
+                    number[target] = len(order)
+                    order.append(target)
+                target = number[target]
+            table.append(target)
+
+    accepting = bytearray(compiled.accepting[s] for s in order)
+    return CompiledAutomata(compiled.symbols, len(order), 0, accepting,
+                            table=table)
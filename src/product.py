@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+from array import array
+
+from .compiled import CompiledAutomata
+from .minimization import hopcroft, quotient
+
+
+def product(compileds, is_union, minimize=False):
+    """Return the product DFA of many DFAs, in compiled form
+
+    A state of the product is a tuple with a state of each DFA. Only tuples
+    reachable from the tuple of initial states are built, in a single
+    breadth-first search. The tuple is final when any (union) or all
+    (intersection) of its states are final.
+
+    Tuples that cannot reach a final state are merged into a single dead
+    state and not explored: for an intersection, it is enough that one DFA
+    is in a dead state. When the initial tuple is already dead, the
+    language is empty and the result, with no search, is a single dead
+    state that is not final.
+
+    With minimize, each DFA is minimized before the product and the
+    product is minimized too.
+    """
+    for compiled in compileds:
+        if not compiled.deterministic:
+            raise Warning('The inputs need to be DFAs to make the product.')
+    if minimize:
+        compileds = [_minimized(compiled) for compiled in compileds]
+
+    symbols = sorted(set().union(*(c.symbols for c in compileds)))
+    k = len(symbols)
+    tables = []
+    lives = []
+    finals = []
+    for compiled in compileds:
+        tables.append(compiled.completed_table(symbols)[0])
+        # the dead state added to complete a table is the last id
+        lives.append(compiled.coreachable() + b'\x00')
+        finals.append(compiled.accepting + b'\x00')
+    combine = any if is_union else all
+
+    def key_of(states):
+        if combine(live[s] for live, s in zip(lives, states)):
+            return states
+        return None
+
+    start = key_of(tuple(compiled.q0 for compiled in compileds))
+    if start is None:
+        return CompiledAutomata(symbols, 1, 0, bytearray(1),
+                                table=array('i', [0]) * k)
+
+    ids = {start: 0}
+    keys = [start]
+    accepting = bytearray()
+    table = array('i')
+    for key in keys:
+        if key is None:
+            accepting.append(0)
+            table.extend([ids[key]] * k)
+            continue
+
+        accepting.append(combine(final[s] for final, s in zip(finals, key)))
+        rows = [s * k for s in key]
+        for symbol in range(k):
+            target = key_of(tuple(t[row + symbol]
+                                  for t, row in zip(tables, rows)))
+            target_id = ids.get(target)
+            if target_id is None:
+                target_id = len(keys)
+                ids[target] = target_id
+                keys.append(target)
+            table.append(target_id)
+
+    result = CompiledAutomata(symbols, len(keys), 0, accepting, table=table)
+    if minimize:
+        return _minimized(result)
+    return result
+
+
+def _minimized(compiled):
+    """Helper to product, minimize a compiled DFA by Hopcroft"""
+    block, count = hopcroft(compiled, compiled.reachable())
+    return quotient(compiled, block, count)
@@ -11,23 +11,115 @@ Alunos:
 - Gabriel Leal Chittolina Amaral
 - Lucas João Martins
 """
-import re
+from array import array
 
-
-class Node:
-    count = 0
-
-    def __init__(self, symbol, left, right):
-        self.symbol = symbol
-        self.left = left
-        self.right = right
-        self.index = Node.count
-        Node.count += 1
+from .compiled import CompiledAutomata
+from .utils import Utils
 
 
 END = '#'
 OPERATORS = ['|', '*', '.', '?']
-ALPHABET = re.compile(r"([A-z0-9&])|(.)")
+NO_NODE = -1
+
+
+class Tree:
+    """Syntax tree of a regex, kept in parallel arrays
+
+    A node is an int id, the index of its symbol, left and right child. A
+    leaf has no children (NO_NODE) and '*' and '?' have only the left one.
+    Each parse has its own tree, so ids start from 0 and parsers share no
+    state. RegexParser._annotate keeps its results in the tree too, one
+    item per node (or per position, for positions and follow).
+    """
+
+    __slots__ = ('symbol', 'left', 'right', 'position', 'nullable',
+                 'firstpos', 'lastpos', 'positions', 'follow')
+
+    def __init__(self):
+        self.symbol = []
+        self.left = array('i')
+        self.right = array('i')
+        # filled by RegexParser._annotate
+        self.position = None
+        self.nullable = None
+        self.firstpos = None
+        self.lastpos = None
+        self.positions = None
+        self.follow = None
+
+    def __len__(self):
+        """Return the number of nodes"""
+        return len(self.symbol)
+
+    def add(self, symbol, left=NO_NODE, right=NO_NODE):
+        """Add a node and return its id"""
+        self.symbol.append(symbol)
+        self.left.append(left)
+        self.right.append(right)
+        return len(self.symbol) - 1
+
+
+class GlushkovMatcher:
+    """Bit-parallel simulation of the Glushkov automaton of a regex
+
+    The states are the positions of the regex plus an initial state. A set
+    of states is a bitset D, where bit 0 is the initial state and bit p + 1
+    is the position p. A step by char c is
+
+        D' = follow(D) & B[c]
+
+    where B[c] has the positions of the symbol c and follow(D) is the union
+    of the followpos of the states in D. follow(D) is read from tables
+    indexed by each byte of D, so a step costs a few lookups no matter how
+    many states are active. Matching is linear in the word and needs no
+    determinization.
+    """
+
+    MAX_POSITIONS = 64
+
+    def __init__(self, symbols, follow, firstpos, lastpos, nullable):
+        size = len(symbols) + 1
+        # follow of each state, shifted to the bit layout of D
+        state_follow = [firstpos << 1]
+        state_follow.extend(mask << 1 for mask in follow)
+
+        self._tables = []
+        for low in range(0, size, 8):
+            table = [0] * 256
+            for value in range(1, 256):
+                bit = value & -value
+                state = low + bit.bit_length() - 1
+                rest = table[value ^ bit]
+                table[value] = rest | (state_follow[state]
+                                       if state < size else 0)
+            self._tables.append(table)
+
+        self._masks = {}
+        for position, symbol in enumerate(symbols):
+            self._masks[symbol] = self._masks.get(symbol, 0) | \
+                1 << position + 1
+        self._final = lastpos << 1 | (1 if nullable else 0)
+
+    def accepts(self, word):
+        """Check if the word is accepted"""
+        return next(self.accepts_many([word]))
+
+    def accepts_many(self, words):
+        """Yield, for each word, if it is accepted"""
+        tables = self._tables
+        masks = self._masks
+        for word in words:
+            state = 1
+            for char in word:
+                follow = 0
+                shift = 0
+                for table in tables:
+                    follow |= table[state >> shift & 255]
+                    shift += 8
+                state = follow & masks.get(char, 0)
+                if not state:
+                    break
+            yield bool(state & self._final)
 
 
 class RegexParser:
@@ -45,115 +137,264 @@ class RegexParser:
 
     def __init__(self, src):
         self.input = src
-        if not self._validate():
-            raise RuntimeError('Invalid input string.')
-
-    def _validate(self):
-        node = self._regex()
-        self.root = node
-        return True
-
-    def _peek(self):
-        if self._more():
-            return self.input[0]
-        else:
-            return ''
+        self.tree = Tree()
+        self.root = self._parse()
+
+    def _parse(self):
+        """Return the root of the tree of the input
+
+        The input is read once, by an index, and the tree is built by a
+        shunting-yard over an explicit stack of operators, so long inputs
+        take linear time and no recursion. '.' (the implicit concatenation)
+        binds tighter than '|', and '*' and '?' apply to the last operand.
+        At the place of a <base>, '(' opens a group and any other char is a
+        <char>.
+        """
+        add = self.tree.add
+        operands = []
+        operators = []
+        expect_base = True
+        i = 0
+        while i < len(self.input):
+            char = self.input[i]
+            if expect_base:
+                if char == '(':
+                    operators.append('(')
+                else:
+                    operands.append(add(char))
+                    expect_base = False
+                i += 1
+            elif char in '*?':
+                operands[-1] = add(char, operands[-1])
+                i += 1
+            elif char == '|':
+                self._reduce(operands, operators, '.|')
+                operators.append('|')
+                expect_base = True
+                i += 1
+            elif char == ')':
+                self._reduce(operands, operators, '.|')
+                if not operators:
+                    raise RuntimeError('Invalid input string.')
+                operators.pop()
+                i += 1
+            else:
+                # the next <factor> of a <term>, char is read again
+                self._reduce(operands, operators, '.')
+                operators.append('.')
+                expect_base = True
 
-    def _eat(self, char):
-        if self._peek() != char:
+        if expect_base:
             raise RuntimeError('Invalid input string.')
-
-        self.input = self.input[1:]
-
-    def _more(self):
-        return len(self.input) > 0
-
-    def _next(self):
-        char = self._peek()
-        self._eat(char)
-        return char
-
-    def _regex(self):
-        term = self._term()
-
-        if self._peek() == '|':
-            self._next()
-            regex = self._regex()
-            node = Node('|', term, regex)
-            return node
-
-        return term
-
-    def _base(self):
-        char = self._peek()
-
-        if char == '(':
-            self._eat('(')
-            regex = self._regex()
-            self._eat(')')
-            return regex
-        elif ALPHABET.match(char):
-            node = Node(self._next(), None, None)
-            return node
-        else:
+        self._reduce(operands, operators, '.|')
+        if operators:
             raise RuntimeError('Invalid input string.')
-
-    def _factor(self):
-        base = self._base()
-
-        while self._more() and self._peek() in ['?', '*']:
-            base = Node(self._next(), base, None)
-
-        return base
-
-    def _term(self):
-        factor = self._factor()
-
-        if self._more() and self._peek() not in ['|', ')']:
-            factor = Node('.', factor, self._term())
-
-        return factor
+        return operands.pop()
+
+    def _reduce(self, operands, operators, symbols):
+        """Helper to _parse, apply the operators on top while in symbols"""
+        while operators and operators[-1] in symbols:
+            right = operands.pop()
+            left = operands.pop()
+            operands.append(self.tree.add(operators.pop(), left, right))
+
+    def to_automata(self):
+        """Return a DFA of the regex by the direct construction
+
+        The regex is augmented with END, then the DFA is built from the
+        followpos of each position, as in the Aho's book, without an NFA.
+        States are sets of positions, kept as bitsets, and a state is final
+        when it has the position of END. A move to no position goes to the
+        empty set, a dead state that is only added when some move needs it,
+        so the DFA is complete.
+        """
+        from .automata import Automata
+        tree = self.tree
+        symbols, follow = self._annotate()
+        # END is a new last position, concatenated to the root
+        end = len(symbols)
+        follow = follow + [0]
+        for position in CompiledAutomata.bits(tree.lastpos[self.root]):
+            follow[position] |= 1 << end
+        initial = tree.firstpos[self.root]
+        if tree.nullable[self.root]:
+            initial |= 1 << end
+
+        alphabet = sorted(set(symbols))
+        masks = [0] * len(alphabet)
+        index = {symbol: i for i, symbol in enumerate(alphabet)}
+        for position, symbol in enumerate(symbols):
+            masks[index[symbol]] |= 1 << position
+
+        states = [initial]
+        ids = {initial: 0}
+        table = array('i')
+        for state in states:
+            for mask in masks:
+                target = 0
+                for position in CompiledAutomata.bits(state & mask):
+                    target |= follow[position]
+                if target not in ids:
+                    ids[target] = len(states)
+                    states.append(target)
+                table.append(ids[target])
+
+        accepting = bytearray(1 if state >> end & 1 else 0
+                              for state in states)
+        return Automata.from_compiled(CompiledAutomata(
+            alphabet, len(states), 0, accepting, table=table))
+
+    def to_nfa(self):
+        """Return an NFA of the regex by the Thompson's construction
+
+        Each node becomes a fragment with a start and an end state, linked
+        to the fragments of its children by moves on epsilon. Children have
+        smaller ids than their parents, so the nodes are walked by id.
+        """
+        from .automata import Automata
+        tree = self.tree
+        moves = []  # list of (symbol, target) of each state
+        starts = array('i')  # first state of the fragment of each node
+        for node in range(len(tree)):
+            symbol = tree.symbol[node]
+            left = tree.left[node]
+            right = tree.right[node]
+            start = len(moves)
+            end = start + 1
+            moves.append([])
+            moves.append([])
+            starts.append(start)
+            # the fragment of a node n is the states starts[n], starts[n] + 1
+            if left == NO_NODE:
+                moves[start].append((symbol, end))
+            elif symbol == '.':
+                moves[start].append((Utils.EPSILON, starts[left]))
+                moves[starts[left] + 1].append((Utils.EPSILON, starts[right]))
+                moves[starts[right] + 1].append((Utils.EPSILON, end))
+            elif symbol == '|':
+                for child in (left, right):
+                    moves[start].append((Utils.EPSILON, starts[child]))
+                    moves[starts[child] + 1].append((Utils.EPSILON, end))
+            else:  # '*' and '?'
+                moves[start].append((Utils.EPSILON, starts[left]))
+                moves[start].append((Utils.EPSILON, end))
+                moves[starts[left] + 1].append((Utils.EPSILON, end))
+                if symbol == '*':
+                    moves[starts[left] + 1].append(
+                        (Utils.EPSILON, starts[left]))
+
+        q0 = starts[self.root]
+        final = q0 + 1
+        alphabet = sorted({symbol for state in moves for symbol, _ in state
+                           if symbol != Utils.EPSILON})
+        index = {symbol: i for i, symbol in enumerate(alphabet)}
+        k = len(alphabet)
+        targets = [[] for _ in range(len(moves) * k)]
+        epsilon = [[] for _ in range(len(moves))]
+        for state, state_moves in enumerate(moves):
+            for symbol, target in state_moves:
+                if symbol == Utils.EPSILON:
+                    epsilon[state].append(target)
+                else:
+                    targets[state * k + index[symbol]].append(target)
+
+        accepting = bytearray(len(moves))
+        accepting[final] = 1
+        return Automata.from_compiled(CompiledAutomata(
+            alphabet, len(moves), q0, accepting,
+            targets=[tuple(t) for t in targets],
+            epsilon=[tuple(t) for t in epsilon]))
+
+    def matcher(self, max_positions=GlushkovMatcher.MAX_POSITIONS):
+        """Return a bit-parallel matcher of the regex
+
+        See GlushkovMatcher. Raise ValueError if the regex has more than
+        max_positions symbols.
+        """
+        tree = self.tree
+        symbols, follow = self._annotate()
+        if len(symbols) > max_positions:
+            raise ValueError('Too many positions to a bit-parallel matcher.')
+        return GlushkovMatcher(symbols, follow, tree.firstpos[self.root],
+                               tree.lastpos[self.root],
+                               tree.nullable[self.root])
+
+    def _annotate(self):
+        """Compute nullable, firstpos, lastpos and followpos of the tree
+
+        Children have smaller ids than their parents and leaves are added
+        in the order of the input, so a single pass by id visits the nodes
+        in post-order and the leaves from left to right. Leaves with a
+        symbol get a position, numbered from 0, and firstpos and lastpos
+        are bitsets of positions. The result is kept in the tree.
+
+        Return the symbol of each position and the followpos of each
+        position, also as a bitset.
+        """
+        tree = self.tree
+        if tree.follow is not None:
+            return tree.positions, tree.follow
+
+        size = len(tree)
+        symbols = []
+        follow = []
+        position = array('i', [NO_NODE]) * size
+        nullable = bytearray(size)
+        firstpos = [0] * size
+        lastpos = [0] * size
+        for node in range(size):
+            symbol = tree.symbol[node]
+            left = tree.left[node]
+            right = tree.right[node]
+            if left == NO_NODE:
+                if symbol == Utils.EPSILON:
+                    nullable[node] = 1
+                else:
+                    position[node] = len(symbols)
+                    symbols.append(symbol)
+                    follow.append(0)
+                    firstpos[node] = lastpos[node] = 1 << position[node]
+            elif symbol == '|':
+                nullable[node] = nullable[left] or nullable[right]
+                firstpos[node] = firstpos[left] | firstpos[right]
+                lastpos[node] = lastpos[left] | lastpos[right]
+            elif symbol == '.':
+                nullable[node] = nullable[left] and nullable[right]
+                firstpos[node] = firstpos[left]
+                if nullable[left]:
+                    firstpos[node] |= firstpos[right]
+                lastpos[node] = lastpos[right]
+                if nullable[right]:
+                    lastpos[node] |= lastpos[left]
+                for p in CompiledAutomata.bits(lastpos[left]):
+                    follow[p] |= firstpos[right]
+            else:  # '*' and '?'
+                nullable[node] = 1
+                firstpos[node] = firstpos[left]
+                lastpos[node] = lastpos[left]
+                if symbol == '*':
+                    for p in CompiledAutomata.bits(lastpos[node]):
+                        follow[p] |= firstpos[node]
+
+        tree.position = position
+        tree.nullable = nullable
+        tree.firstpos = firstpos
+        tree.lastpos = lastpos
+        tree.positions = symbols
+        tree.follow = follow
+        return symbols, follow
 
     def _firstpos(self, node):
-        if node.symbol == '|':
-            return self._firstpos(node.left).union(self._firstpos(node.right))
-        if node.symbol == '.':
-            if self._nullable(node.left):
-                return self._firstpos(node.left).union(
-                    self._firstpos(node.right))
-            else:
-                return self._firstpos(node.left)
-        if node.symbol == '*':
-            return self._firstpos(node.left)
-
-        if self._nullable(node):
-            return set([])
-        else:
-            return set([node.index])
+        """Return the set of positions that can start the node"""
+        self._annotate()
+        return set(CompiledAutomata.bits(self.tree.firstpos[node]))
 
     def _lastpos(self, node):
-        if node.symbol == '|':
-            return self._firstpos(node.right).union(self._firstpos(node.left))
-        if node.symbol == '.':
-            if self._nullable(node.right):
-                return self._firstpos(node.right).union(
-                    self._firstpos(node.left))
-            else:
-                return self._firstpos(node.right)
-        if node.symbol == '*':
-            return self._firstpos(node.right)
-
-        if self._nullable(node):
-            return set([])
-        else:
-            return set([node.index])
+        """Return the set of positions that can end the node"""
+        self._annotate()
+        return set(CompiledAutomata.bits(self.tree.lastpos[node]))
 
     def _nullable(self, node):
-        if node.symbol == '*':
-            return True
-        if node.symbol == '|':
-            return self._nullable(node.left) or self._nullable(node.right)
-        if node.symbol == '.':
-            return self._nullable(node.left) and self._nullable(node.right)
-
-        return False
+        """Check if the node generates the empty string"""
+        self._annotate()
+        return bool(self.tree.nullable[node])
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import mmap
+import re
+from array import array
+from collections import namedtuple
+
+from .compiled import NO_TRANSITION
+
+try:
+    import numpy
+except ImportError:  # the scanner still works, one record at a time
+    numpy = None
+
+MATCH = namedtuple('Match', ['record', 'start', 'end'])
+WINDOW = 1 << 20  # bytes searched at once for separators, with numpy
+
+
+class Scanner:
+    """Scan a buffer of records, reporting the ones accepted by a DFA
+
+    The buffer is split by the separator byte (a line by default) and each
+    record is run over the DFA. Each byte is a symbol, so only symbols of
+    one char that fit in a byte are used. Any other byte rejects the record.
+
+    With numpy, records are processed in batches: at each position, every
+    record of the batch that is still long enough advances with a single
+    gather over the transition table. Without numpy, the same table is
+    walked by a plain loop per record. In both ways, the buffer is read
+    as the records are scanned, with no copy of it, so big files mapped
+    by mmap are scanned in memory bounded by the batch.
+    """
+
+    def __init__(self, automata, separator=b'\n', batch_size=65536):
+        compiled = automata.compile()
+        if not compiled.deterministic:
+            raise Warning('Its necessary be a DFA to scan.')
+
+        self.separator = separator[0]
+        self.batch_size = batch_size
+
+        # byte -> class. Class k is for bytes out of the alphabet
+        k = len(compiled.symbols)
+        classes = bytearray([k]) * 256
+        for symbol, char in enumerate(compiled.symbols):
+            if len(char) == 1 and ord(char) < 256:
+                classes[ord(char)] = symbol
+        self._classes = bytes(classes)
+
+        # a complete table with an extra dead state and an extra class
+        width = k + 1
+        dead = compiled.size
+        table = array('i', [dead]) * ((compiled.size + 1) * width)
+        for state in range(compiled.size):
+            for symbol in range(k):
+                target = compiled.table[state * k + symbol]
+                if target != NO_TRANSITION:
+                    table[state * width + symbol] = target
+        self._table = table
+        self._width = width
+        self._q0 = compiled.q0
+        self._accepting = bytes(compiled.accepting) + b'\x00'
+
+    def scan(self, buffer, vectorized=True):
+        """Yield a Match for each record of the buffer that is accepted
+
+        The buffer is a bytes-like object, a memoryview or a mmap. Matches
+        come in order, with the record number and its [start, end) range.
+        """
+        if vectorized and numpy is not None:
+            return self._scan_numpy(buffer)
+        return self._scan_python(buffer)
+
+    def scan_file(self, filename, vectorized=True):
+        """Yield a Match for each accepted record of a file, using mmap"""
+        with open(filename, 'rb') as read_file:
+            try:
+                data = mmap.mmap(read_file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+            except ValueError:  # empty file can't be mapped
+                return
+            with data:
+                yield from self.scan(data, vectorized)
+
+    def _records(self, buffer):
+        """Yield the [start, end) range of each record of the buffer
+
+        The separator is searched by a regex, that reads bytes, mmaps and
+        memoryviews in place.
+        """
+        search = re.compile(re.escape(bytes([self.separator]))).search
+        start = 0
+        length = len(buffer)
+        while start < length:
+            found = search(buffer, start)
+            end = found.start() if found is not None else length
+            yield start, end
+            start = end + 1
+
+    def _batches(self, data):
+        """Yield the starts and ends of the records, batch_size at a time
+
+        Separators are searched in windows of WINDOW bytes from the end of
+        the last batch, and only until the batch is full, so the memory used
+        does not grow with the size of the buffer.
+        """
+        length = len(data)
+        start = 0
+        while start < length:
+            found = []
+            count = 0
+            position = start
+            while count < self.batch_size and position < length:
+                window = data[position:position + WINDOW]
+                ends = numpy.flatnonzero(window == self.separator)
+                ends = ends[:self.batch_size - count] + position
+                if len(ends):
+                    found.append(ends)
+                    count += len(ends)
+                position += len(window)
+            # a last record with no separator after it
+            if count < self.batch_size and \
+                    (not found or found[-1][-1] != length - 1):
+                found.append(numpy.array([length], dtype=numpy.intp))
+
+            ends = numpy.concatenate(found)
+            starts = numpy.empty_like(ends)
+            starts[0] = start
+            starts[1:] = ends[:-1] + 1
+            yield starts, ends
+            start = int(ends[-1]) + 1
+
+    def _scan_python(self, buffer):
+        table = self._table
+        width = self._width
+        accepting = self._accepting
+        classes = self._classes
+        for record, (start, end) in enumerate(self._records(buffer)):
+            state = self._q0
+            for symbol in bytes(buffer[start:end]).translate(classes):
+                state = table[state * width + symbol]
+            if accepting[state]:
+                yield MATCH(record, start, end)
+
+    def _scan_numpy(self, buffer):
+        data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+        table = numpy.frombuffer(self._table, dtype=numpy.int32)
+        accepting = numpy.frombuffer(self._accepting, dtype=numpy.uint8)
+        classes = numpy.frombuffer(self._classes, dtype=numpy.uint8)
+        width = self._width
+
+        first = 0
+        for starts, ends in self._batches(data):
+            lengths = ends - starts
+
+            # longest records first, so the active ones are always a prefix
+            order = numpy.argsort(-lengths, kind='stable')
+            batch_starts = starts[order]
+            negative_lengths = -lengths[order]
+
+            states = numpy.full(len(order), self._q0, dtype=numpy.int32)
+            for position in range(int(-negative_lengths[0])):
+                active = int(numpy.searchsorted(negative_lengths, -position))
+                symbols = classes[data[batch_starts[:active] + position]]
+                states[:active] = table[states[:active] * width + symbols]
+
+            hits = numpy.sort(order[accepting[states] != 0])
+            for record in hits:
+                record = int(record)
+                yield MATCH(first + record, int(starts[record]),
+                            int(ends[record]))
+            first += len(starts)
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""INE 5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from .compiled import CompiledAutomata, NO_TRANSITION
+
+MAGIC = b'ATMB'
+VERSION = 1
+EXTENSION = '.atm'
+
+# magic, version, flags, size, symbols, q0, length of symbols, of names
+HEADER = struct.Struct('<4sHHIIIII')
+FLAG_NAMES = 1
+
+
+def dumps(compiled):
+    """Return the binary form of a compiled DFA
+
+    The layout, in little-endian, is:
+    - the header: MAGIC, VERSION, flags, number of states and symbols, q0
+    and the length of the symbol table and of the state names;
+    - the symbol table: an uint32 end offset of each symbol, then the
+    symbols in UTF-8. The state names follow in the same way when the
+    states are not the default 'qi';
+    - padding to 4 bytes, a byte per state flagging the final ones, and
+    padding again;
+    - the DFA table, states x symbols, as raw int32.
+    """
+    if not compiled.deterministic:
+        raise Warning('Its necessary be a DFA to save in binary form.')
+
+    symbols = _strings(compiled.symbols)
+    default = tuple('q' + str(i) for i in range(compiled.size))
+    names = b''
+    flags = 0
+    if compiled.states != default:
+        names = _strings(compiled.states)
+        flags |= FLAG_NAMES
+
+    table = array('i', compiled.table)
+    if sys.byteorder != 'little':
+        table.byteswap()
+
+    parts = [HEADER.pack(MAGIC, VERSION, flags, compiled.size,
+                         len(compiled.symbols), compiled.q0, len(symbols),
+                         len(names)), symbols, names]
+    parts.append(_padding(parts))
+    parts.append(bytes(compiled.accepting))
+    parts.append(_padding(parts))
+    parts.append(table.tobytes())
+    return b''.join(parts)
+
+
+def loads(buffer):
+    """Return a compiled DFA from its binary form
+
+    The table of the result is a memoryview of buffer, with no copy, when
+    the machine is little-endian. See dumps.
+
+    Offsets and lengths read from the buffer are checked against its size,
+    so a truncated or corrupt buffer always raises ValueError. The moves in
+    the table are not checked here, see check_table.
+    """
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise ValueError('Invalid binary automata.')
+    magic, version, flags, size, k, q0, symbols_length, names_length = \
+        HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError('Invalid binary automata.')
+    if version != VERSION:
+        raise ValueError('Unsupported version of binary automata.')
+    if q0 >= size or (names_length and not flags & FLAG_NAMES):
+        raise ValueError('Invalid binary automata.')
+
+    offset = HEADER.size
+    symbols = _read_strings(view, offset, k, symbols_length)
+    offset += symbols_length
+    names = None
+    if flags & FLAG_NAMES:
+        names = _read_strings(view, offset, size, names_length)
+    offset = _aligned(offset + names_length)
+    accepting = bytearray(view[offset:offset + size])
+    offset = _aligned(offset + size)
+    end = offset + size * k * 4
+    if len(accepting) != size or len(view) < end:
+        raise ValueError('Invalid binary automata.')
+
+    if sys.byteorder == 'little' and array('i').itemsize == 4:
+        table = view[offset:end].cast('i')
+    else:
+        table = array('i')
+        table.frombytes(view[offset:end])
+        table.byteswap()
+    return CompiledAutomata(symbols, size, q0, accepting, table=table,
+                            states=names)
+
+
+def check_table(compiled):
+    """Raise ValueError if a move of a compiled DFA is not a valid state
+
+    It reads the whole table, so loads leaves it to who needs it.
+    """
+    table = compiled.table
+    if len(table) and (min(table) < NO_TRANSITION or
+                       max(table) >= compiled.size):
+        raise ValueError('Invalid binary automata.')
+
+
+def save(compiled, filename):
+    """Save a compiled DFA in a binary file, with the exact filename"""
+    _write(filename, dumps(compiled))
+
+
+def load(filename):
+    """Return a compiled DFA from a binary file, mapped by mmap
+
+    The file is mapped read-only and the table is read from the mapping, so
+    only the pages that are used are loaded.
+    """
+    with open(filename, 'rb') as read_file:
+        if not os.fstat(read_file.fileno()).st_size:
+            raise ValueError('Invalid binary automata.')
+        mapping = mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads(mapping)
+
+
+class AutomataStore:
+    """Directory of compiled DFAs in binary form, addressed by content
+
+    A DFA is saved under the sha256 of a key, so processes that compile
+    the same source, as a regex or a grammar, find it by the key of the
+    source. Keys are made of str, int, tuple and frozenset, as the keys of
+    CompilationCache, and frozensets are sorted to make the address
+    canonical. A store can be given to CompilationCache, so its misses are
+    looked up on disk before being built.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        """Return the file of a key"""
+        return os.path.join(self.directory, address(key) + EXTENSION)
+
+    def load(self, key):
+        """Return the compiled DFA of a key, or None if it is not saved
+
+        A file that is truncated or corrupt is removed and also gives None,
+        so the DFA is built and saved again.
+        """
+        path = self.path(key)
+        try:
+            compiled = load(path)
+            check_table(compiled)
+            return compiled
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+
+    def save(self, key, compiled):
+        """Save the compiled DFA of a key"""
+        _write(self.path(key), dumps(compiled))
+
+
+def address(key):
+    """Return the sha256, in hex, of a canonical form of a key"""
+    data = json.dumps(_canonical(key), ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _canonical(key):
+    """Helper to address, turn a key in nested lists"""
+    if isinstance(key, (tuple, list)):
+        return [_canonical(item) for item in key]
+    if isinstance(key, (set, frozenset)):
+        return sorted((_canonical(item) for item in key), key=json.dumps)
+    return key
+
+
+def _strings(strings):
+    """Helper to dumps, encode the end offsets and the UTF-8 strings"""
+    encoded = [s.encode('utf-8') for s in strings]
+    ends = array('I')
+    end = 0
+    for data in encoded:
+        end += len(data)
+        ends.append(end)
+    if sys.byteorder != 'little':
+        ends.byteswap()
+    return ends.tobytes() + b''.join(encoded)
+
+
+def _read_strings(view, offset, count, length):
+    """Helper to loads, decode what was written by _strings"""
+    if count * 4 > length or offset + length > len(view):
+        raise ValueError('Invalid binary automata.')
+    ends = array('I')
+    ends.frombytes(view[offset:offset + count * 4])
+    if sys.byteorder != 'little':
+        ends.byteswap()
+    data = bytes(view[offset + count * 4:offset + length])
+    start = 0
+    strings = []
+    for end in ends:
+        if end < start or end > len(data):
+            raise ValueError('Invalid binary automata.')
+        try:
+            strings.append(data[start:end].decode('utf-8'))
+        except UnicodeDecodeError:
+            raise ValueError('Invalid binary automata.') from None
+        start = end
+    return strings
+
+
+def _aligned(offset):
+    """Helper to round an offset up to 4 bytes"""
+    return offset + -offset % 4
+
+
+def _padding(parts):
+    """Helper to dumps, return the padding to align the parts to 4 bytes"""
+    length = sum(len(part) for part in parts)
+    return b'\x00' * (_aligned(length) - length)
+
+
+def _write(filename, data):
+    """Helper to write a file atomically, by a rename"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    descriptor, temporary = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(descriptor, 'wb') as write_file:
+            write_file.write(data)
+        os.replace(temporary, filename)
+    except BaseException:
+        os.unlink(temporary)
+        raise
@@ -14,6 +14,7 @@ Alunos:
 import unittest
 import os
 from src.automata import Automata
+from src.compiled import CompiledAutomata, NO_TRANSITION
 from src.utils import Utils
 
 
@@ -42,6 +43,70 @@ class AutomataTests(unittest.TestCase):
         self.assertRaises(ValueError, Automata,
                           {'a'}, {'A', 'B', 'a'}, 'A', {'B'}, transitions)
 
+    def test_full_validation(self):
+        transitions = self._create_transitions()
+        transitions[Utils.TRANSITION('B', 'c')] = {'A'}
+        Automata({'a'}, {'A', 'B'}, 'A', {'B'}, transitions)
+        self.assertRaises(ValueError, Automata, {'a'}, {'A', 'B'}, 'A',
+                          {'B'}, transitions, 'full')
+        transitions = self._create_transitions()
+        transitions[Utils.TRANSITION('B', Utils.EPSILON)] = {'C'}
+        self.assertRaises(ValueError, Automata, {'a'}, {'A', 'B'}, 'A',
+                          {'B'}, transitions, 'full')
+        self.assertRaises(ValueError, Automata, {'a'}, {'A', 'B'}, 'A',
+                          {'B'}, transitions, 'unknown')
+
+    def test_trusted_validation(self):
+        transitions = self._create_transitions()
+        fa = Automata({'a'}, {'A', 'B'}, 'C', {'B'}, transitions, 'trusted')
+        self.assertEqual('C', fa.q0)
+        # the automatas of {} and {&} have no final states or transitions
+        fa = Automata(set(), {'A'}, 'A', set(), {}, 'trusted')
+        self.assertSetEqual(set(), fa.final_states)
+        self.assertRaises(ValueError, Automata, {'a'}, set(), 'A',
+                          set(), transitions, 'trusted')
+
+    def test_add_and_remove_transition(self):
+        fa = self._create_automata()
+        self.assertFalse(fa.deterministic)
+        self.assertFalse(fa.complete)
+        fa.add_transition('A', 'b', 'A')
+        fa.add_transition('B', 'a', 'B')
+        fa.add_transition('B', 'b', 'A')
+        self.assertTrue(fa.deterministic)
+        self.assertTrue(fa.complete)
+        self.assertTrue(fa.accepts('ba'))
+        fa.add_transition('B', 'b', 'B')
+        self.assertFalse(fa.deterministic)
+        self.assertTrue(fa.complete)
+        fa.remove_transition('B', 'b', 'B')
+        self.assertTrue(fa.deterministic)
+        fa.remove_transition('B', 'b')
+        self.assertFalse(fa.complete)
+        self.assertNotIn(Utils.TRANSITION('B', 'b'), fa.transitions)
+        self.assertRaises(ValueError, fa.add_transition, 'A', 'c', 'B')
+        self.assertRaises(ValueError, fa.remove_transition, 'B', 'b')
+
+    def test_counts_from_compiled(self):
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        for fa in [nfa, nfa.to_dfa(), nfa.to_dfa().minimize()]:
+            counts = list(fa._transition_counts())
+            fa.invalidate()
+            self.assertListEqual(counts, fa._transition_counts())
+
+    def test_lazy_transitions(self):
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        dfa = Automata.from_compiled(nfa.to_dfa().compile())
+        self.assertIsNone(dfa._transitions)
+        self.assertTrue(dfa.deterministic)
+        self.assertIsNone(dfa._transitions)
+        expected = Automata._transitions_of(dfa.compile())
+        self.assertDictEqual(expected, dfa.transitions)
+        self.assertIs(dfa.transitions, dfa.transitions)
+        other = Automata.from_compiled(dfa.compile())
+        other.invalidate()
+        self.assertDictEqual(expected, other.transitions)
+
     def test_save_json(self):
         fa = self._create_automata()
         filename = 'test_save_json'
@@ -49,10 +114,72 @@ class AutomataTests(unittest.TestCase):
         # clean the disk
         os.remove(filename + '.json')
 
+    def test_save_json_layouts(self):
+        fa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        filename = 'test_save_json_layouts'
+        for compact in [False, True]:
+            for grouped in [False, True]:
+                fa.save_json(filename, compact=compact, grouped=grouped)
+                loaded = Automata.read_from_json(filename, validate=True)
+                self.assertDictEqual(fa.transitions, loaded.transitions)
+                compiled = CompiledAutomata.read_from_json(filename)
+                self.assertEqual(fa.compile().targets, compiled.targets)
+        dfa = fa.to_dfa().minimize()
+        dfa.save_json(filename, grouped=True)
+        self.assertIsNone(dfa._transitions)
+        loaded = Automata.read_from_json(filename, validate=True)
+        self.assertDictEqual(dfa.transitions, loaded.transitions)
+        # clean the disk
+        os.remove(filename + '.json')
+
     def test_read_json(self):
         fa = Automata.read_from_json('./test/data/test_read_json')
         self.assertIsInstance(fa, Automata)
 
+    def test_read_json_validate(self):
+        fa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02',
+                                     validate=True)
+        self.assertFalse(fa.deterministic)
+        filename = 'test_read_json_validate'
+        with open(filename + '.json', 'w') as write_file:
+            write_file.write('{"transitions": [["A", "a", ["D"]]], '
+                             '"alphabet": ["a"], "states": ["A"], '
+                             '"q0": "A", "final_states": ["A"]}')
+        self.assertRaises(ValueError, Automata.read_from_json, filename,
+                          True)
+        Automata.read_from_json(filename)
+        # clean the disk
+        os.remove(filename + '.json')
+
+    def test_read_json_compiled(self):
+        for name in ['test_read_json', 'test_nfa_to_dfa_02']:
+            filename = './test/data/' + name
+            expected = Automata.read_from_json(filename).compile()
+            compiled = CompiledAutomata.read_from_json(filename)
+            self.assertTupleEqual(expected.states, compiled.states)
+            self.assertTupleEqual(expected.symbols, compiled.symbols)
+            self.assertEqual(expected.accepting, compiled.accepting)
+            self.assertEqual(expected.table, compiled.table)
+            self.assertEqual(expected.targets, compiled.targets)
+            self.assertEqual(expected.epsilon, compiled.epsilon)
+
+    def test_read_json_compiled_undeclared(self):
+        filename = 'test_read_json_undeclared'
+        # an undeclared final state, then an undeclared q0
+        for q0, final in [('A', 'B'), ('B', 'A')]:
+            with open(filename + '.json', 'w') as write_file:
+                write_file.write('{"alphabet": ["a"], "states": ["A"], '
+                                 '"q0": "%s", "final_states": ["%s"], '
+                                 '"transitions": [["A", "a", ["A"]]]}'
+                                 % (q0, final))
+            self.assertRaises(ValueError, Automata.read_from_json, filename)
+            self.assertRaises(ValueError, CompiledAutomata.read_from_json,
+                              filename)
+            self.assertRaises(ValueError, CompiledAutomata.read_from_json,
+                              filename, True)
+        # clean the disk
+        os.remove(filename + '.json')
+
     def test_e_closure_empty(self):
         fa = self._create_automata()
         self.assertSetEqual(set(fa.q0), fa._e_closure([fa.q0]))
@@ -70,6 +197,47 @@ class AutomataTests(unittest.TestCase):
         fa = Automata({'0'}, {'q0', 'q1', 'q2'}, 'q0', {'q2'}, transitions)
         self.assertSetEqual({'q0', 'q1'}, fa._e_closure([fa.q0]))
 
+    def test_e_closure_cycle(self):
+        transitions = {Utils.TRANSITION('q0', Utils.EPSILON): {'q1'},
+                       Utils.TRANSITION('q1', Utils.EPSILON): {'q2'},
+                       Utils.TRANSITION('q2', Utils.EPSILON): {'q0', 'q3'},
+                       Utils.TRANSITION('q3', '0'): {'q4'},
+                       Utils.TRANSITION('q4', Utils.EPSILON): {'q3'}}
+        fa = Automata({'0'}, {'q0', 'q1', 'q2', 'q3', 'q4'}, 'q0', {'q4'},
+                      transitions)
+        self.assertSetEqual({'q0', 'q1', 'q2', 'q3'}, fa._e_closure(['q1']))
+        self.assertSetEqual({'q3', 'q4'}, fa._e_closure(['q4']))
+
+    def test_e_closure_invalidate(self):
+        t0 = Utils.TRANSITION('q0', Utils.EPSILON)
+        t1 = Utils.TRANSITION('q1', '0')
+        transitions = {t0: {'q1'}, t1: {'q2'}}
+        fa = Automata({'0'}, {'q0', 'q1', 'q2'}, 'q0', {'q2'}, transitions)
+        self.assertSetEqual({'q0', 'q1'}, fa._e_closure([fa.q0]))
+        fa.transitions[Utils.TRANSITION('q1', Utils.EPSILON)] = {'q2'}
+        fa.invalidate()
+        self.assertSetEqual({'q0', 'q1', 'q2'}, fa._e_closure([fa.q0]))
+
+    def test_remove_epsilon(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abba', 'aab', 'bab']
+        nfa = Automata.read_from_json('./test/data/' +
+                                      'test_e_closure_book_aho_example_334')
+        free = nfa.remove_epsilon()
+        self.assertNotIn(Utils.EPSILON, {key[1] for key in free.transitions})
+        self.assertSetEqual(nfa.states, free.states)
+        self.assertListEqual(list(nfa.accepts_many(words)),
+                             list(free.accepts_many(words)))
+
+    def test_remove_epsilon_only(self):
+        nfa = Automata({'a'}, {'q0', 'q1'}, 'q0', {'q1'},
+                       {Utils.TRANSITION('q0', Utils.EPSILON): {'q1'}})
+        free = nfa.remove_epsilon()
+        self.assertSetEqual({'q0'}, free.states)
+        self.assertSetEqual({'q0'}, free.final_states)
+        self.assertDictEqual({}, free.transitions)
+        self.assertTrue(free.accepts(''))
+        self.assertFalse(free.accepts('a'))
+
     def test_move_empty(self):
         fa = self._create_automata()
         self.assertCountEqual([], fa._move({'B'}, 'a'))
@@ -159,6 +327,20 @@ class AutomataTests(unittest.TestCase):
         self.assertEqual(12, len(dfa.transitions))
         self.assertTrue(dfa.deterministic)
 
+    def test_nfa_to_dfa_engines(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abba', 'aab', 'bab']
+        for name in ['test_nfa_to_dfa_02', 'test_nfa_to_dfa_05',
+                     'test_e_closure_book_aho_example_334']:
+            nfa = Automata.read_from_json('./test/data/' + name)
+            bitset = nfa.to_dfa(engine='bitset')
+            subset = nfa.to_dfa(engine='subset')
+            self.assertEqual(len(subset.states), len(bitset.states))
+            self.assertEqual(len(subset.final_states),
+                             len(bitset.final_states))
+            self.assertListEqual(list(subset.accepts_many(words)),
+                                 list(bitset.accepts_many(words)))
+        self.assertRaises(ValueError, nfa.to_dfa, engine='unknown')
+
     def test_define_unreachable_with_few_state(self):
         transitions = {Utils.TRANSITION('A', '0'): {'A'},
                        Utils.TRANSITION('B', '0'): {'B'}}
@@ -256,6 +438,70 @@ class AutomataTests(unittest.TestCase):
         self.assertEqual(1, len(mdfa.final_states))
         self.assertEqual(10, len(mdfa.transitions))
 
+    def test_dfa_minimization_canonical(self):
+        dfa = Automata.read_from_json('./test/data/test_dfa_minimization_02')
+        renamed = {state: 'x' + state for state in dfa.states}
+        transitions = {Utils.TRANSITION(renamed[k[0]], k[1]):
+                       {renamed[t] for t in v}
+                       for k, v in dfa.transitions.items()}
+        other = Automata(dfa.alphabet, set(renamed.values()),
+                         renamed[dfa.q0],
+                         {renamed[s] for s in dfa.final_states}, transitions)
+        self.assertDictEqual(dfa.minimize().transitions,
+                             other.minimize().transitions)
+
+    def test_dfa_minimization_strategies(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abba', 'aab', 'bab']
+        dfa = Automata.read_from_json('./test/data/test_dfa_minimization_04')
+        hopcroft = dfa.minimize()
+        for strategy in ['brzozowski', 'valmari']:
+            mdfa = dfa.minimize(strategy=strategy)
+            self.assertEqual(len(hopcroft.states), len(mdfa.states))
+            self.assertListEqual(list(hopcroft.accepts_many(words)),
+                                 list(mdfa.accepts_many(words)))
+        self.assertRaises(ValueError, dfa.minimize, strategy='unknown')
+
+    def test_minimization_degenerate_languages(self):
+        words = ['', 'a', 'aa']
+        transitions = {Utils.TRANSITION('1', 'a'): {'2'},
+                       Utils.TRANSITION('2', 'a'): {'2'}}
+        # {&}, and {} since the final state is not reachable
+        dfas = [Automata({'a'}, {'1', '2'}, '1', {'1'}, transitions),
+                Automata({'a'}, {'1', '2'}, '1', {'2'},
+                         {Utils.TRANSITION('1', 'a'): {'1'},
+                          Utils.TRANSITION('2', 'a'): {'2'}})]
+        for dfa, finals in zip(dfas, [1, 0]):
+            expected = list(dfa.accepts_many(words))
+            for strategy in ['hopcroft', 'brzozowski', 'valmari']:
+                mdfa = dfa.minimize(strategy=strategy)
+                self.assertEqual(expected, list(mdfa.accepts_many(words)))
+                self.assertEqual(finals, len(mdfa.final_states))
+        valmari = dfas[1].minimize(strategy='valmari')
+        self.assertEqual(1, len(valmari.states))
+        self.assertDictEqual({}, valmari.transitions)
+
+    def test_nfa_minimization_brzozowski(self):
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_05')
+        mdfa = nfa.minimize(strategy='brzozowski')
+        self.assertTrue(mdfa.deterministic)
+        self.assertEqual(len(nfa.to_dfa().minimize().states),
+                         len(mdfa.states))
+
+    def test_partial_dfa_minimization_valmari(self):
+        transitions = {Utils.TRANSITION('A', 'a'): {'B'},
+                       Utils.TRANSITION('B', 'b'): {'C'},
+                       Utils.TRANSITION('C', 'a'): {'B'},
+                       Utils.TRANSITION('D', 'b'): {'C'},
+                       Utils.TRANSITION('E', 'a'): {'E'}}
+        dfa = Automata({'a', 'b'}, {'A', 'B', 'C', 'D', 'E'}, 'A', {'C'},
+                       transitions)
+        mdfa = dfa.minimize(strategy='valmari')
+        # D is unreachable and E is dead, both are removed
+        self.assertEqual(3, len(mdfa.states))
+        self.assertEqual(3, len(mdfa.transitions))
+        self.assertTrue(mdfa.accepts('abab'))
+        self.assertFalse(mdfa.accepts('aba'))
+
     def test_union_01(self):
         # example from https://goo.gl/Rj1T8T
         transitions_01 = {Utils.TRANSITION('1', 'a'): {'2'},
@@ -337,11 +583,10 @@ class AutomataTests(unittest.TestCase):
         in_01 = Automata.read_from_json('./test/data/test_union_03_input_01')
         in_02 = Automata.read_from_json('./test/data/test_union_03_input_02')
         intersection = in_01.intersection(in_02)
-        # transition by transition was checked by hand with print :|
-        # cannot check transition by transition because of the randomness
-        self.assertEqual(9, len(intersection.states))
+        # only reachable pairs are built and the dead ones are merged
+        self.assertEqual(6, len(intersection.states))
         self.assertEqual(1, len(intersection.final_states))
-        self.assertEqual(18, len(intersection.transitions))
+        self.assertEqual(12, len(intersection.transitions))
 
     def test_intersection_03(self):
         # first example from https://goo.gl/5tH9QF
@@ -364,11 +609,10 @@ class AutomataTests(unittest.TestCase):
         in_02 = Automata({'a', 'b'}, {'1', '2', '3'}, '1', {'3'},
                          transitions_02)
         intersection = in_01.intersection(in_02)
-        # transition by transition was checked by hand with print :|
-        # cannot check transition by transition because of the randomness
-        self.assertEqual(12, len(intersection.states))
+        # only reachable pairs are built and the dead ones are merged
+        self.assertEqual(10, len(intersection.states))
         self.assertEqual(1, len(intersection.final_states))
-        self.assertEqual(24, len(intersection.transitions))
+        self.assertEqual(20, len(intersection.transitions))
 
     def test_intersection_04(self):
         # second example from https://goo.gl/5tH9QF
@@ -386,11 +630,197 @@ class AutomataTests(unittest.TestCase):
         in_02 = Automata({'a', 'b'}, {'1', '2', '3'}, '1', {'1'},
                          transitions_02)
         intersection = in_01.intersection(in_02)
-        # transition by transition was checked by hand with print :|
-        # cannot check transition by transition because of the randomness
-        self.assertEqual(6, len(intersection.states))
+        # only reachable pairs are built and the dead ones are merged
+        self.assertEqual(5, len(intersection.states))
         self.assertEqual(1, len(intersection.final_states))
-        self.assertEqual(12, len(intersection.transitions))
+        self.assertEqual(10, len(intersection.transitions))
+
+    def test_intersection_empty(self):
+        transitions_01 = {Utils.TRANSITION('1', 'a'): {'2'},
+                          Utils.TRANSITION('1', 'b'): {'1'},
+                          Utils.TRANSITION('2', 'a'): {'2'},
+                          Utils.TRANSITION('2', 'b'): {'2'}}
+        # words with some 'a'
+        in_01 = Automata({'a', 'b'}, {'1', '2'}, '1', {'2'}, transitions_01)
+        # words without 'a'
+        in_02 = Automata({'a', 'b'}, {'1', '2'}, '1', {'1'}, transitions_01)
+        empty = in_01.intersection(in_02)
+        self.assertSetEqual(set(), empty.final_states)
+        self.assertTrue(empty.deterministic)
+        self.assertTrue(empty.is_empty())
+        self.assertEqual(2, len(in_01.union(in_02).states))
+
+    def test_intersection_disjoint(self):
+        # a+ and {&}, both complete DFAs
+        plus = Automata({'a'}, {'1', '2'}, '1', {'2'},
+                        {Utils.TRANSITION('1', 'a'): {'2'},
+                         Utils.TRANSITION('2', 'a'): {'2'}})
+        word = Automata({'a'}, {'1', '2'}, '1', {'1'},
+                        {Utils.TRANSITION('1', 'a'): {'2'},
+                         Utils.TRANSITION('2', 'a'): {'2'}})
+        empty = plus.intersection(word)
+        self.assertIsInstance(empty, Automata)
+        self.assertSetEqual(set(), empty.final_states)
+        self.assertFalse(any(empty.accepts_many(['', 'a', 'aa'])))
+        self.assertTrue(plus.union(word).accepts(''))
+        # the final state is not reachable, so the search does not start
+        never = Automata({'a'}, {'1', '2'}, '1', {'2'},
+                         {Utils.TRANSITION('1', 'a'): {'1'},
+                          Utils.TRANSITION('2', 'a'): {'2'}})
+        empty = plus.intersection(never)
+        self.assertEqual(1, len(empty.states))
+        self.assertSetEqual(set(), empty.final_states)
+        self.assertTrue(empty.deterministic)
+        self.assertEqual(1, len(never.union(never).states))
+
+    def test_union_all(self):
+        names = ['test_union_03_input_01', 'test_union_03_input_02',
+                 'test_union_04_input_01', 'test_union_04_input_02']
+        automatas = [Automata.read_from_json('./test/data/' + name)
+                     for name in names]
+        union = Automata.union_all(automatas, minimize=True)
+        chained = automatas[0]
+        for automata in automatas[1:]:
+            chained = chained.union(automata)
+        self.assertEqual(len(chained.minimize().states), len(union.states))
+        self.assertEqual(union.transitions,
+                         Automata.union_all(automatas).minimize().transitions)
+
+    def test_intersection_all(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abba', 'aab', 'bab']
+        names = ['test_union_03_input_01', 'test_union_03_input_02']
+        automatas = [Automata.read_from_json('./test/data/' + name)
+                     for name in names]
+        automatas.append(Automata.read_from_json(
+            './test/data/test_nfa_to_dfa_02').to_dfa())
+        intersection = Automata.intersection_all(automatas)
+        for word in words:
+            self.assertEqual(all(a.accepts(word) for a in automatas),
+                             intersection.accepts(word))
+
+    def test_compile_dfa(self):
+        dfa = Automata.read_from_json('./test/data/test_define_unreachable')
+        compiled = dfa.compile()
+        self.assertIsInstance(compiled, CompiledAutomata)
+        self.assertTrue(compiled.deterministic)
+        self.assertEqual(dfa.q0, compiled.states[compiled.q0])
+        self.assertEqual(len(dfa.states) * len(dfa.alphabet),
+                         len(compiled.table))
+        self.assertIs(compiled, dfa.compile())
+
+    def test_compile_partial_dfa(self):
+        fa = Automata.read_from_json('./test/data/test_read_json')
+        compiled = fa.compile()
+        self.assertTrue(compiled.deterministic)
+        self.assertFalse(compiled.is_complete())
+        a = compiled.symbol_index['a']
+        b = compiled.symbol_index['b']
+        self.assertEqual(NO_TRANSITION, compiled.table[compiled.q0 * 2 + b])
+        self.assertEqual('B', compiled.states[compiled.table[
+            compiled.q0 * 2 + a]])
+
+    def test_compile_nfa(self):
+        fa = Automata.read_from_json('./test/data/' +
+                                     'test_e_closure_book_aho_example_334')
+        compiled = fa.compile()
+        self.assertFalse(compiled.deterministic)
+        zero = compiled.state_index['0']
+        self.assertCountEqual(['1', '7'], [compiled.states[s] for s in
+                              compiled.epsilon_successors(zero)])
+
+    def test_compile_invalidate(self):
+        fa = self._create_automata()
+        compiled = fa.compile()
+        fa.transitions = self._create_transitions()
+        self.assertIsNot(compiled, fa.compile())
+
+    def test_from_compiled(self):
+        fa = Automata.read_from_json('./test/data/' +
+                                     'test_e_closure_book_aho_example_334')
+        same = Automata.from_compiled(fa.compile())
+        self.assertSetEqual(fa.states, same.states)
+        self.assertSetEqual(fa.final_states, same.final_states)
+        self.assertEqual(fa.q0, same.q0)
+        self.assertDictEqual(fa.transitions, same.transitions)
+
+    def test_accepts_dfa(self):
+        dfa = Automata.read_from_json('./test/data/test_union_04_input_01')
+        self.assertTrue(dfa.accepts('1'))
+        self.assertTrue(dfa.accepts('0100'))
+        self.assertFalse(dfa.accepts(''))
+        self.assertFalse(dfa.accepts('11'))
+        self.assertFalse(dfa.accepts('12'))
+
+    def test_accepts_partial_dfa(self):
+        fa = Automata.read_from_json('./test/data/test_read_json')
+        self.assertTrue(fa.accepts('ab'))
+        self.assertFalse(fa.accepts('b'))
+        self.assertFalse(fa.accepts('aba'))
+
+    def test_accepts_nfa(self):
+        # (a|b)*
+        nfa = Automata.read_from_json('./test/data/' +
+                                      'test_e_closure_book_aho_example_334')
+        self.assertTrue(nfa.accepts(''))
+        self.assertTrue(nfa.accepts('abba'))
+        self.assertTrue(nfa.accepts(['a', 'b']))
+        self.assertFalse(nfa.accepts('abc'))
+
+    def test_accepts_many(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abba', 'aaa', 'bab']
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        dfa = nfa.to_dfa()
+        expected = [dfa.accepts(word) for word in words]
+        self.assertListEqual(expected, list(nfa.accepts_many(words)))
+        self.assertListEqual(expected, list(dfa.accepts_many(words)))
+
+    def test_lazy_dfa(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abba', 'aab', 'bab']
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_05')
+        lazy = nfa.to_dfa(lazy=True)
+        expected = list(nfa.to_dfa().accepts_many(words))
+        self.assertListEqual(expected, list(lazy.accepts_many(words)))
+        self.assertLessEqual(len(lazy), 6)
+
+    def test_lazy_dfa_eviction(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abba', 'aab', 'bab']
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_05')
+        lazy = nfa.to_dfa(lazy=True, max_states=1)
+        expected = list(nfa.accepts_many(words))
+        self.assertListEqual(expected, list(lazy.accepts_many(words)))
+        self.assertEqual(1, len(lazy))
+        self.assertGreater(lazy.evictions, 0)
+
+    def test_is_empty(self):
+        self.assertTupleEqual((False, 'a'),
+                              self._create_automata().is_empty(witness=True))
+        # the final state is not reachable
+        fa = Automata({'a'}, {'A', 'B'}, 'A', {'B'}, {('A', 'a'): {'A'}})
+        self.assertTrue(fa.is_empty())
+        self.assertTupleEqual((True, None), fa.is_empty(witness=True))
+
+    def test_is_equivalent(self):
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        dfa = nfa.to_dfa()
+        self.assertTrue(nfa.is_equivalent(dfa))
+        self.assertTrue(dfa.is_equivalent(dfa.minimize()))
+        fa = self._create_automata()
+        result, word = fa.is_equivalent(dfa, witness=True)
+        self.assertFalse(result)
+        self.assertNotEqual(fa.accepts(word), dfa.accepts(word))
+
+    def test_is_subset(self):
+        fa = self._create_automata()
+        # a*, as an NFA with a move on &
+        star = Automata({'a'}, {'A', 'B'}, 'A', {'B'},
+                        {('A', Utils.EPSILON): {'B'}, ('B', 'a'): {'B'}})
+        self.assertTrue(fa.is_subset(star))
+        self.assertTupleEqual((False, ''), star.is_subset(fa, witness=True))
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        result, word = nfa.is_subset(fa, witness=True)
+        self.assertFalse(result)
+        self.assertTrue(nfa.accepts(word))
+        self.assertFalse(fa.accepts(word))
 
     def _create_automata(self):
         """Helper that create and return a default automata."""
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""INE5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import unittest
+from src.cache import CompilationCache, compile_grammar, compile_regex, \
+    normalize_pattern
+from src.grammar import Grammar
+
+
+class CompilationCacheTests(unittest.TestCase):
+    """Tests to CompilationCache class"""
+
+    def test_get(self):
+        cache = CompilationCache(max_size=2)
+        for key in ['a', 'b', 'a', 'c', 'b']:
+            cache.get(key, lambda: key.upper())
+        # 'b' was the least recently used when 'c' came in
+        self.assertEqual((1, 4, 2, 2, 2), tuple(cache.stats()))
+        self.assertIn('c', cache)
+        self.assertNotIn('a', cache)
+        cache.resize(1)
+        self.assertListEqual(['b'], list(cache._values))
+        self.assertRaises(ValueError, cache.resize, 0)
+
+    def test_normalize_pattern(self):
+        self.assertEqual('(a*)*b?|*c', normalize_pattern('(a*?)**b??|*c'))
+        self.assertEqual('a*|b', normalize_pattern('a*|b'))
+
+    def test_compile_regex(self):
+        cache = CompilationCache()
+        dfa = compile_regex('(ab|c)*', cache)
+        self.assertIs(dfa, compile_regex('(ab|c)**', cache))
+        self.assertEqual(1, cache.hits)
+        self.assertTrue(dfa.deterministic)
+        self.assertTrue(dfa.accepts('abcab'))
+        self.assertFalse(dfa.accepts('abb'))
+        # the automata of 'a*' is already a complete DFA
+        self.assertTrue(compile_regex('a*', cache).accepts('aa'))
+        # the language {&} has an automata with no symbols
+        self.assertTrue(compile_regex('&', cache).accepts(''))
+
+    def test_compile_grammar(self):
+        cache = CompilationCache()
+        productions = [('S', 'a', 'S'), ('S', 'a', 'A'), ('A', 'b')]
+        dfa = compile_grammar(Grammar(productions, 'S'), cache)
+        self.assertIs(dfa, compile_grammar(
+            Grammar(reversed(productions), 'S'), cache))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(4, len(dfa.states))
+        self.assertTrue(dfa.accepts('aab'))
+        self.assertFalse(dfa.accepts('b'))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""INE5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import unittest
+from src.automata import Automata
+from src.utils import Utils
+
+
+class FrozenAutomataTests(unittest.TestCase):
+    """Tests to FrozenAutomata class"""
+
+    def test_freeze(self):
+        fa = self._create_dfa()
+        frozen = fa.freeze()
+        self.assertSetEqual(fa.states, frozen.states)
+        self.assertSetEqual(fa.final_states, frozen.final_states)
+        self.assertEqual(fa.q0, frozen.q0)
+        self.assertRaises(AttributeError, setattr, frozen, '_compiled', None)
+        # the compiled form is a copy with read-only parts
+        compiled = frozen.compile()
+        self.assertTrue(compiled.table.readonly)
+        self.assertIsInstance(compiled.accepting, bytes)
+        fingerprint = frozen.fingerprint()
+        compiled.accepting = bytearray(compiled.size)
+        compiled.symbol_index.clear()
+        self.assertIsNot(compiled, frozen.compile())
+        self.assertEqual(fingerprint, frozen.thaw().freeze().fingerprint())
+        self.assertTrue(frozen.accepts('1'))
+        # changes to the automata do not reach the frozen one
+        fa.remove_transition('q0', '1')
+        fa.add_transition('q0', '1', 'q0')
+        self.assertTrue(frozen.accepts('1'))
+        self.assertFalse(fa.accepts('1'))
+
+    def test_nfa(self):
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        self.assertRaises(Warning, nfa.freeze)
+
+    def test_hash(self):
+        frozen = self._create_dfa().freeze()
+        renamed = frozen.rename({'q0': 'even', 'q1': 'odd'})
+        self.assertEqual(frozen, renamed)
+        self.assertEqual(hash(frozen), hash(renamed))
+        self.assertEqual(1, len({frozen, renamed}))
+        self.assertEqual('even', renamed.q0)
+        # the table is shared
+        self.assertIs(frozen.compile().table.obj,
+                      renamed.compile().table.obj)
+        other = Automata.read_from_json(
+            './test/data/test_union_04_input_02').freeze()
+        self.assertNotEqual(frozen, other)
+        self.assertRaises(ValueError, frozen.rename, {'q0': 'q1'})
+
+    def test_restrict_to_reachable(self):
+        fa = self._create_dfa()
+        frozen = fa.freeze()
+        self.assertIs(frozen, frozen.restrict_to_reachable())
+
+        # q2 has the last id, so the result shares a prefix of the table
+        fa.states.add('q2')
+        fa.add_transition('q2', '0', 'q1')
+        fa.add_transition('q2', '1', 'q1')
+        frozen = fa.freeze()
+        restricted = frozen.restrict_to_reachable()
+        self.assertSetEqual({'q0', 'q1'}, restricted.states)
+        self.assertIs(frozen.compile().table.obj,
+                      restricted.compile().table.obj)
+        self.assertEqual(frozen, restricted)
+
+        # the initial state has the id 0, so a state named before the other
+        # ones is in the middle of the table
+        fa.states.add('p')
+        fa.add_transition('p', '0', 'q1')
+        restricted = fa.freeze().restrict_to_reachable()
+        self.assertSetEqual({'q0', 'q1'}, restricted.states)
+        self.assertEqual(frozen, restricted)
+        self.assertTrue(restricted.accepts('010'))
+
+    def test_thaw(self):
+        fa = self._create_dfa()
+        thawed = fa.freeze().thaw()
+        self.assertDictEqual(fa.transitions, thawed.transitions)
+        self.assertTrue(thawed.deterministic)
+
+    def _create_dfa(self):
+        """Helper that create and return a DFA of odd number of '1'."""
+        transitions = {Utils.TRANSITION('q0', '0'): {'q0'},
+                       Utils.TRANSITION('q0', '1'): {'q1'},
+                       Utils.TRANSITION('q1', '0'): {'q1'},
+                       Utils.TRANSITION('q1', '1'): {'q0'}}
+        return Automata({'0', '1'}, {'q0', 'q1'}, 'q0', {'q1'}, transitions)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""INE5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import unittest
+import os
+from src.automata import Automata
+from src.grammar import END, Grammar
+from src.utils import Utils
+
+
+class GrammarTests(unittest.TestCase):
+    """Tests to Grammar class"""
+
+    def test_save_and_read_json(self):
+        grammar = self._create_grammar()
+        filename = 'test_grammar_json'
+        grammar.save_json(filename)
+        loaded = Grammar.read_from_json(filename, validate=True)
+        # clean the disk
+        os.remove(filename + '.json')
+        self.assertSetEqual(grammar._productions, loaded._productions)
+        self.assertEqual(grammar._initial_symbol, loaded._initial_symbol)
+
+    def test_save_json_compact(self):
+        grammar = self._create_grammar()
+        filename = 'test_grammar_compact'
+        grammar.save_json(filename, compact=True)
+        with open(filename + '.json') as read_file:
+            text = read_file.read()
+        loaded = Grammar.read_from_json(filename)
+        # clean the disk
+        os.remove(filename + '.json')
+        self.assertNotIn(' ', text)
+        self.assertSetEqual(grammar._productions, loaded._productions)
+
+    def test_read_json_validate(self):
+        filename = 'test_grammar_validate'
+        with open(filename + '.json', 'w') as write_file:
+            write_file.write('{"productions": [["S", "a", "S", "b"]], '
+                             '"initial_symbol": "S"}')
+        self.assertRaises(ValueError, Grammar.read_from_json, filename, True)
+        # clean the disk
+        os.remove(filename + '.json')
+
+    def test_index(self):
+        grammar = Grammar([('S', 'a', 'A'), ('A', 'b', 'S'), ('A', 'b'),
+                           ('S', Utils.EPSILON, 'A')], 'S')
+        self.assertEqual('S', grammar._nonterminal_names[0])
+        self.assertSetEqual({'S', 'A'}, grammar._nonterminals)
+        self.assertSetEqual({'a', 'b'}, grammar._terminals)
+        a = grammar._terminal_names.index('a')
+        b = grammar._terminal_names.index('b')
+        self.assertDictEqual({a: [1]}, grammar._rows[0])
+        self.assertCountEqual([0, END], grammar._rows[1][b])
+        self.assertListEqual([1], grammar._epsilon[0])
+
+    def test_to_automaton(self):
+        automata = self._create_grammar().to_automaton()
+        self.assertSetEqual({'S', Utils.NEW_FINAL_STATE}, automata.states)
+        self.assertSetEqual({'S', Utils.NEW_FINAL_STATE},
+                            automata.transitions[('S', 'a')] |
+                            automata.transitions[('S', 'b')])
+
+    def test_to_dfa(self):
+        words = ['', 'a', 'b', 'ab', 'ba', 'aab', 'abb', 'bab', 'abab']
+        grammars = [
+            self._create_grammar(),
+            # a(ba)*b?, with productions on &
+            Grammar([('S', 'a', 'A'), ('A', 'b', 'S'), ('A', 'b'),
+                     ('A', Utils.EPSILON)], 'S'),
+            # a*(a|b|a+b|b+a), nondeterministic
+            Grammar([('S', 'a', 'A'), ('S', 'b', 'B'), ('S', 'a'),
+                     ('S', 'b'), ('A', 'a', 'A'), ('A', 'b'),
+                     ('B', 'b', 'B'), ('B', 'a'), ('S', 'a', 'S')], 'S')
+        ]
+        for grammar in grammars:
+            dfa = grammar.to_dfa()
+            self.assertTrue(dfa.deterministic)
+            nfa = grammar.to_automaton()
+            self.assertListEqual(list(nfa.accepts_many(words)),
+                                 list(dfa.accepts_many(words)))
+
+    def test_generates(self):
+        # a(ba)*b?, with productions on &
+        grammar = Grammar([('S', 'a', 'A'), ('A', 'b', 'S'), ('A', 'b'),
+                           ('A', Utils.EPSILON)], 'S')
+        self.assertTrue(grammar.generates('aba'))
+        self.assertTrue(grammar.generates('ab'))
+        self.assertFalse(grammar.generates(''))
+        self.assertFalse(grammar.generates('abc'))
+        words = ['', 'a', 'b', 'ab', 'ba', 'aab', 'abab', 'ababa', 'abb']
+        dfa = grammar.to_dfa()
+        self.assertListEqual(list(dfa.accepts_many(words)),
+                             list(grammar.generates_many(words)))
+        self.assertIs(grammar.compile(), grammar.compile())
+
+    def test_simplify(self):
+        grammar = Grammar([('S', 'a', 'A'), ('S', Utils.EPSILON, 'B'),
+                           ('B', 'b'), ('B', 'b', 'B'), ('A', 'a', 'C'),
+                           ('C', 'c', 'C'), ('D', 'd')], 'S')
+        simplified, report = grammar.simplify()
+        self.assertSetEqual({('S', 'b'), ('S', 'b', 'B'), ('B', 'b'),
+                             ('B', 'b', 'B')}, simplified._productions)
+        self.assertEqual(1, report.unit_productions)
+        self.assertSetEqual({'A', 'C'}, report.unproductive)
+        self.assertSetEqual({'D'}, report.unreachable)
+        self.assertEqual((7, 4), (report.before, report.after))
+
+    def test_simplify_epsilon(self):
+        # S -> &A, A -> &, so S generates the empty word
+        grammar = Grammar([('S', Utils.EPSILON, 'A'), ('A', Utils.EPSILON),
+                           ('A', 'a', 'S')], 'S')
+        simplified, report = grammar.simplify()
+        self.assertSetEqual({('S', Utils.EPSILON), ('S', 'a', 'S')},
+                            simplified._productions)
+        self.assertSetEqual({'A'}, report.unreachable)
+
+    def test_simplify_empty(self):
+        grammar = Grammar([('S', 'a', 'S'), ('S', 'b', 'A')], 'S')
+        simplified, report = grammar.simplify()
+        self.assertSetEqual(set(), simplified._productions)
+        self.assertSetEqual({'S', 'A'}, report.unproductive)
+        automata = grammar.to_automaton(simplify=True)
+        self.assertSetEqual({'S'}, automata.states)
+        self.assertSetEqual(set(), automata.final_states)
+        self.assertFalse(automata.accepts('ab'))
+        self.assertListEqual(
+            list(grammar.to_automaton().accepts_many(['', 'b', 'ab'])),
+            list(automata.accepts_many(['', 'b', 'ab'])))
+
+    def test_to_dfa_simplify(self):
+        words = ['', 'a', 'b', 'ab', 'bb', 'abb']
+        grammar = Grammar([('S', 'a', 'A'), ('S', Utils.EPSILON, 'B'),
+                           ('B', 'b'), ('B', 'b', 'B'), ('A', 'a', 'C'),
+                           ('C', 'c', 'C')], 'S')
+        dfa = grammar.to_dfa(simplify=True)
+        self.assertSetEqual({'b'}, dfa.alphabet)
+        self.assertListEqual(list(grammar.to_dfa().accepts_many(words)),
+                             list(dfa.accepts_many(words)))
+        nfa = grammar.to_automaton(simplify=True)
+        self.assertSetEqual({'S', 'B', Utils.NEW_FINAL_STATE}, nfa.states)
+
+    def test_from_nfa(self):
+        # with moves on &: one nonterminal by state, nothing is determinized
+        nfa = Automata.read_from_json(
+            './test/data/test_e_closure_book_aho_example_334')
+        grammar = nfa.to_grammar()
+        self.assertEqual(len(nfa.states), len(grammar._nonterminals))
+        self.assertNotIn(Utils.EPSILON, grammar._terminals)
+        words = ['', 'abb', 'aabb', 'babb', 'ab', 'abba', 'bbabb']
+        self.assertListEqual(list(nfa.accepts_many(words)),
+                             list(grammar.to_dfa().accepts_many(words)))
+
+    def test_from_automata_empty_word(self):
+        dfa = Automata({'a'}, {'a0', 'a1'}, 'a0', {'a0'},
+                       {('a0', 'a'): {'a1'}, ('a1', 'a'): {'a0'}})
+        grammar = dfa.to_grammar()
+        self.assertSetEqual({('A0', Utils.EPSILON), ('A0', 'a', 'A1'),
+                             ('A1', 'a', 'A0'), ('A1', 'a')},
+                            grammar._productions)
+        self.assertEqual('A0', grammar._initial_symbol)
+
+    def _create_grammar(self):
+        """Helper that create and return a grammar of a*b"""
+        return Grammar([('S', 'a', 'S'), ('S', 'b')], 'S')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""INE5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import unittest
+import io
+import json
+from src import jsonio
+
+
+class JsonIOTests(unittest.TestCase):
+    """Tests to the streaming of json files"""
+
+    DATA = {
+        'q0': 'A',
+        'transitions': [['A', 'a', ['B', 'C']], ['B', '&', []],
+                        ['C', 'b', ['A']]],
+        'numbers': [12345, -1.5e3, True, None],
+        'empty': [],
+        'final_states': ['C']
+    }
+
+    def test_load_object(self):
+        for indent in [None, 4]:
+            text = json.dumps(self.DATA, indent=indent)
+            for chunk_size in [1, 2, 7, 1000]:
+                elements = []
+                data = jsonio.load_object(
+                    io.StringIO(text), {'transitions': elements.append,
+                                        'empty': elements.append},
+                    chunk_size=chunk_size)
+                self.assertListEqual(self.DATA['transitions'], elements)
+                self.assertDictEqual({k: v for k, v in self.DATA.items()
+                                      if k not in ('transitions', 'empty')},
+                                     data)
+
+    def test_load_object_invalid(self):
+        for text in ['', '[]', '{"a": 1', '{"a": [1, 2}', '{"a" 1}']:
+            self.assertRaises(ValueError, jsonio.load_object,
+                              io.StringIO(text), {'a': [].append},
+                              chunk_size=2)
+
+    def test_load_object_members(self):
+        members = []
+        data = jsonio.load_object(
+            io.StringIO('{"t": {"A": {"a": ["B"]}, "B": {}}, "q0": "A"}'),
+            {'t': members.append}, chunk_size=3)
+        self.assertListEqual([('A', {'a': ['B']}), ('B', {})], members)
+        self.assertDictEqual({'q0': 'A'}, data)
+        transitions = [t for m in members for t in jsonio.transitions_of(m)]
+        self.assertListEqual([['A', 'a', ['B']]], transitions)
+
+    def test_dump_object(self):
+        expected = {'q0': 'A', 'transitions': self.DATA['transitions'],
+                    'rows': {'A': [1]}, 'empty': []}
+        for indent, separators in [(None, (',', ':')), (4, None)]:
+            members = [
+                ('q0', 'A'),
+                ('transitions', jsonio.STREAMED_ARRAY(
+                    iter(self.DATA['transitions']))),
+                ('rows', jsonio.STREAMED_OBJECT(iter([('A', [1])]))),
+                ('empty', jsonio.STREAMED_ARRAY(iter([])))
+            ]
+            write_file = io.StringIO()
+            jsonio.dump_object(write_file, members, indent=indent)
+            self.assertEqual(json.dumps(expected, indent=indent,
+                                        separators=separators),
+                             write_file.getvalue())
+
+    def test_check_transition(self):
+        jsonio.check_transition(['A', 'a', ['B']])
+        for element in [['A', 'a', 'B'], ['A', 'a'], ['A', 1, ['B']]]:
+            self.assertRaises(ValueError, jsonio.check_transition, element)
+
+    def test_check_declared(self):
+        data = {'states': ['A', 'B'], 'alphabet': ['a']}
+        jsonio.check_declared(data, {'A', 'B'}, {'a', '&'})
+        self.assertRaises(ValueError, jsonio.check_declared, data, {'C'},
+                          {'a'})
+        self.assertRaises(ValueError, jsonio.check_declared, data, {'A'},
+                          {'b'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""INE5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import unittest
+from src.regex import NO_NODE, RegexParser
+
+
+class RegexParserTests(unittest.TestCase):
+    """Tests to RegexParser class"""
+
+    WORDS = ['', 'a', 'b', 'c', 'ab', 'abb', 'aabb', 'babb', 'abc', 'ac',
+             'bc', 'abab', 'cab']
+
+    def test_to_automata_book_example(self):
+        # example 3.56 from the Aho's book
+        dfa = RegexParser('(a|b)*abb').to_automata()
+        self.assertTrue(dfa.deterministic)
+        self.assertEqual(4, len(dfa.states))
+        self.assertEqual(1, len(dfa.final_states))
+        self._assert_language(dfa, ['abb', 'aabb', 'babb'])
+
+    def test_to_automata_optional(self):
+        dfa = RegexParser('a*b?c').to_automata()
+        self._assert_language(dfa, ['c', 'ac', 'bc', 'abc'])
+
+    def test_to_automata_epsilon(self):
+        dfa = RegexParser('a(b|&)c').to_automata()
+        self._assert_language(dfa, ['ac', 'abc'])
+
+    def test_to_automata_complete(self):
+        dfa = RegexParser('ab|c').to_automata()
+        self.assertTrue(dfa.deterministic)
+        # initial, after a, final and the dead state
+        self.assertEqual(4, len(dfa.states))
+        mdfa = dfa.minimize()
+        self._assert_language(mdfa, ['ab', 'c'])
+        self._assert_language(dfa.union(RegexParser('a').to_automata()),
+                              ['a', 'ab', 'c'])
+
+    def test_to_automata_empty_word(self):
+        for src in ['&', '(&)?', '((&)?)?', '&*']:
+            dfa = RegexParser(src).to_automata()
+            self.assertSetEqual(set(), dfa.alphabet)
+            self._assert_language(dfa, [''])
+
+    def test_to_automata_star(self):
+        dfa = RegexParser('(ab|c)*').to_automata()
+        self._assert_language(dfa, ['', 'c', 'ab', 'abc', 'abab', 'cab'])
+
+    def test_to_nfa(self):
+        for src in ['(a|b)*abb', 'a*b?c', 'a(b|&)c', '(ab|c)*']:
+            parser = RegexParser(src)
+            nfa = parser.to_nfa()
+            self.assertFalse(nfa.deterministic)
+            dfa = parser.to_automata()
+            self.assertListEqual(list(dfa.accepts_many(self.WORDS)),
+                                 list(nfa.accepts_many(self.WORDS)))
+
+    def test_to_nfa_empty_word(self):
+        for src in ['&', '(&)?', '((&)?)?']:
+            nfa = RegexParser(src).to_nfa()
+            self.assertTrue(nfa.accepts(''))
+            self.assertFalse(nfa.accepts('a'))
+            self.assertEqual(1, len(nfa.final_states))
+
+    def test_matcher(self):
+        for src in ['(a|b)*abb', 'a*b?c', 'a(b|&)c', '(ab|c)*']:
+            parser = RegexParser(src)
+            dfa = parser.to_automata()
+            self.assertListEqual(list(dfa.accepts_many(self.WORDS)),
+                                 list(parser.matcher().accepts_many(
+                                     self.WORDS)))
+
+    def test_matcher_many_positions(self):
+        # 'a' at the 21st symbol from the end
+        matcher = RegexParser('(a|b)*a' + '(a|b)' * 20).matcher()
+        self.assertTrue(matcher.accepts('ba' + 'b' * 20))
+        self.assertFalse(matcher.accepts('ab' + 'b' * 20))
+        self.assertRaises(ValueError, RegexParser('(a|b)' * 40).matcher)
+
+    def test_positions(self):
+        parser = RegexParser('(a|b)*a')
+        self.assertFalse(parser._nullable(parser.root))
+        self.assertSetEqual({0, 1, 2}, parser._firstpos(parser.root))
+        self.assertSetEqual({2}, parser._lastpos(parser.root))
+
+    def test_tree(self):
+        first = RegexParser('a*b')
+        second = RegexParser('a*b')
+        # each parse numbers its nodes from 0
+        self.assertEqual(first.root, second.root)
+        self.assertListEqual(['a', '*', 'b', '.'], first.tree.symbol)
+        self.assertEqual(1, first.tree.left[first.root])
+        self.assertEqual(NO_NODE, first.tree.right[1])
+
+    def test_invalid(self):
+        for src in ['', '(ab', 'a|', 'ab)', '()']:
+            self.assertRaises(RuntimeError, RegexParser, src)
+
+    def test_long_alternation(self):
+        keywords = ['k' + str(i) for i in range(5000)]
+        dfa = RegexParser('|'.join(keywords)).to_automata()
+        self.assertTrue(dfa.accepts('k4999'))
+        self.assertFalse(dfa.accepts('k5000'))
+
+    def _assert_language(self, automata, language):
+        """Helper that check the accepted words among WORDS."""
+        accepted = [w for w in self.WORDS if automata.accepts(w)]
+        self.assertCountEqual(language, accepted)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""INE5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import unittest
+import os
+from src.automata import Automata
+from src.scanner import Scanner, numpy
+
+
+class ScannerTests(unittest.TestCase):
+    """Tests to Scanner class"""
+
+    LINES = ['1', '0100', '', '11', '12', '0111', '10', 'x']
+
+    def test_scan(self):
+        scanner = Scanner(self._create_dfa())
+        buffer = '\n'.join(self.LINES).encode()
+        matches = list(scanner.scan(buffer, vectorized=False))
+        self.assertListEqual([0, 1, 5, 6], [m.record for m in matches])
+        self.assertEqual(b'0111', buffer[matches[2].start:matches[2].end])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_scan_vectorized(self):
+        scanner = Scanner(self._create_dfa(), batch_size=3)
+        buffer = memoryview('\n'.join(self.LINES).encode())
+        self.assertListEqual(list(scanner.scan(buffer, vectorized=False)),
+                             list(scanner.scan(buffer)))
+
+    def test_scan_file(self):
+        scanner = Scanner(self._create_dfa())
+        filename = 'test_scan_file.txt'
+        with open(filename, 'wb') as write_file:
+            write_file.write('\n'.join(self.LINES).encode() + b'\n')
+        matches = [m.record for m in scanner.scan_file(filename)]
+        # clean the disk
+        os.remove(filename)
+        self.assertListEqual([0, 1, 5, 6], matches)
+
+    def test_scan_nfa(self):
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        self.assertRaises(Warning, Scanner, nfa)
+
+    def _create_dfa(self):
+        """Helper that create and return a DFA of odd number of '1'."""
+        return Automata.read_from_json('./test/data/test_union_04_input_01')
+
+if __name__ == '__main__':
+    unittest.main()
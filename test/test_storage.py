@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""INE5421 - Linguagem Formais e Compiladores - Trabalho 01
+
+Universidade Federal de Santa Catarina
+
+Departamento de Informática e Estatística (INE)
+
+Alunos:
+
+- Filipe Oliveira de Borba
+- Gabriel Leal Chittolina Amaral
+- Lucas João Martins
+"""
+import unittest
+import os
+import tempfile
+from src.automata import Automata
+from src.cache import CompilationCache, compile_regex
+from src import storage
+
+
+class StorageTests(unittest.TestCase):
+    """Tests to the binary form of automatas"""
+
+    def test_dumps_loads(self):
+        compiled = self._create_dfa().compile()
+        data = storage.dumps(compiled)
+        self.assertEqual(storage.MAGIC, data[:4])
+        loaded = storage.loads(data)
+        self.assertIsInstance(loaded.table, memoryview)
+        self.assertListEqual(list(compiled.table), list(loaded.table))
+        self.assertTupleEqual(compiled.symbols, loaded.symbols)
+        self.assertTupleEqual(compiled.states, loaded.states)
+        self.assertEqual(compiled.accepting, loaded.accepting)
+        self.assertEqual(compiled.q0, loaded.q0)
+
+    def test_partial_dfa(self):
+        compiled = compile_regex('ab|ac', CompilationCache()).compile()
+        loaded = storage.loads(storage.dumps(compiled))
+        self.assertTrue(loaded.accepts('ac'))
+        self.assertFalse(loaded.accepts('a'))
+
+    def test_invalid(self):
+        data = storage.dumps(self._create_dfa().compile())
+        self.assertRaises(ValueError, storage.loads, b'XXXX' + data[4:])
+        self.assertRaises(ValueError, storage.loads, data[:-4])
+        # the end of the first symbol is past the symbol table
+        corrupt = bytearray(data)
+        corrupt[storage.HEADER.size] = 0xff
+        self.assertRaises(ValueError, storage.loads, bytes(corrupt))
+        nfa = Automata.read_from_json('./test/data/test_nfa_to_dfa_02')
+        self.assertRaises(Warning, storage.dumps, nfa.compile())
+
+    def test_save_binary(self):
+        fa = self._create_dfa()
+        filename = 'test_save_binary'
+        fa.save_binary(filename)
+        loaded = Automata.read_from_binary(filename)
+        self.assertSetEqual(fa.states, loaded.states)
+        self.assertDictEqual(fa.transitions, loaded.transitions)
+        # clean the disk
+        del loaded
+        os.remove(filename + storage.EXTENSION)
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = storage.AutomataStore(directory)
+            first = CompilationCache(store=store)
+            dfa = compile_regex('(ab|c)*', first)
+            self.assertEqual(1, len(os.listdir(directory)))
+
+            # a new cache, as in another process, finds it in the store
+            second = CompilationCache(store=store)
+            loaded = compile_regex('(ab|c)*', second)
+            self.assertEqual(1, second.misses)
+            self.assertSetEqual(dfa.states, loaded.states)
+            self.assertTrue(loaded.accepts('cab'))
+            self.assertIsNone(store.load(('regex', 'a')))
+
+    def test_store_corrupt(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = storage.AutomataStore(directory)
+            compile_regex('(ab|c)*', CompilationCache(store=store))
+            path = os.path.join(directory, os.listdir(directory)[0])
+            with open(path, 'rb') as read_file:
+                data = read_file.read()
+            for corrupt in [data[:20], data[:storage.HEADER.size + 6],
+                            data[:-4], data[:-4] + b'\xff\xff\xff\x7f']:
+                with open(path, 'wb') as write_file:
+                    write_file.write(corrupt)
+                # a miss: the entry is dropped, built and saved again
+                cache = CompilationCache(store=store)
+                self.assertTrue(compile_regex('(ab|c)*', cache).accepts('cab'))
+                with open(path, 'rb') as read_file:
+                    self.assertEqual(data, read_file.read())
+
+    def test_address(self):
+        self.assertEqual(storage.address(('g', frozenset({'a', 'b'}))),
+                         storage.address(('g', frozenset({'b', 'a'}))))
+        self.assertNotEqual(storage.address('a'), storage.address('b'))
+
+    def _create_dfa(self):
+        """Helper that create and return a DFA of odd number of '1'."""
+        return Automata.read_from_json('./test/data/test_union_04_input_01')
+
+if __name__ == '__main__':
+    unittest.main()